@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+    Compare the memory held by the settings catalog entries as `SettingRecord`s against the
+    former `{'description': ..., 'value': ...}` dictionaries, outside Sublime Text.
+
+    python3 benchmarks/bench_memory.py [packages]
+
+    Each generated package has a default settings file, plus a platform one repeating part of
+    its settings and descriptions, as the Default package does. The entries are measured both
+    right after parsing the files and after loading them back from the catalog cache.
+"""
+
+import os
+import sys
+import json
+import tracemalloc
+
+benchmarks_directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(benchmarks_directory))
+
+import sublime_stub
+from package_tree import generate_preferences
+
+
+def legacy_parse_preference_resource(parse_settings, preference_data):
+    """
+        The dictionary based implementation replaced by `SettingRecord`
+    """
+    preference_settings = {}
+    preference_data, description, offsets = parse_settings(preference_data)
+
+    for setting_name, setting_value in preference_data.items():
+
+        if setting_name not in description:
+            preference_settings[setting_name] = {"description": "No help available"}
+
+        else:
+            preference_settings[setting_name] = description[setting_name]
+
+        preference_settings[setting_name]['value'] = setting_value
+
+    return preference_settings
+
+
+def generate_packages(packages):
+    """
+        @return dict: {'Packages/Package 1/Package 1.sublime-settings': 'contents', ...}
+    """
+    files = {}
+
+    for index in range(packages):
+        default_file = generate_preferences(keys=300, seed=7 + index % 5)
+        platform_file = generate_preferences(keys=100, seed=7 + index % 5)
+
+        files["Packages/Package %s/Package %s.sublime-settings" % (index, index)] = default_file
+        files["Packages/Package %s/Package %s (Linux).sublime-settings" % (index, index)] = platform_file
+
+    return files
+
+
+def measure(function):
+    """
+        @return tuple: (result, bytes) with the memory still held by the result of `function()`
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    result = function()
+    after = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main(arguments):
+    sublime_stub.install()
+    import quick_settings
+
+    packages = int( arguments[0] ) if arguments else 40
+    files = generate_packages(packages)
+
+    def parse_legacy():
+        return dict( (name, {'settings': legacy_parse_preference_resource(quick_settings.parse_settings, data)}) for name, data in files.items() )
+
+    def parse_records():
+        return dict( (name, {'settings': quick_settings.parse_preference_resource(name, data)}) for name, data in files.items() )
+
+    legacy_entries, legacy_parsed = measure(parse_legacy)
+    record_entries, record_parsed = measure(parse_records)
+
+    legacy_cache = json.dumps(legacy_entries)
+    record_cache = json.dumps(record_entries, default=quick_settings.encode_setting_record)
+
+    def load_legacy():
+        return json.loads(legacy_cache)
+
+    def load_records():
+        entries = json.loads(record_cache)
+
+        for entry in entries.values():
+            entry['settings'] = quick_settings.make_setting_records(entry['settings'])
+
+        return entries
+
+    legacy_loaded = measure(load_legacy)[1]
+    record_loaded = measure(load_records)[1]
+
+    settings = sum( len( entry['settings'] ) for entry in record_entries.values() )
+    print("%s settings files, %s settings" % (len( files ), settings))
+
+    for title, legacy, records in (("parsed", legacy_parsed, record_parsed), ("loaded from the cache", legacy_loaded, record_loaded)):
+        print("    %s:" % title)
+        print("        dictionaries:   %8.2f MiB" % (legacy / 1024 / 1024))
+        print("        SettingRecord:  %8.2f MiB" % (records / 1024 / 1024))
+        print("        saved:          %8.2f%%" % (100 - records * 100 / legacy))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
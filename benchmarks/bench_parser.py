@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+    Compare `parse_settings()` against the former `get_descriptions()` plus
+    `sublime.decode_value()` pair, outside Sublime Text.
+
+    python3 benchmarks/bench_parser.py ["/path/to/Default/Preferences.sublime-settings" ...]
+
+    Without arguments, it uses a generated file with the shape of the Default package
+    `Preferences.sublime-settings`. Each file is also checked to give the same results with
+    both implementations, and with the pure Python parser used for the streamed files.
+
+    The `sublime.decode_value()` of Sublime Text is native, so both implementations are timed
+    with a stand-in running at about the same speed: `json.loads()` on the file contents
+    without their comments, which are removed before the timing starts.
+"""
+
+import os
+import re
+import sys
+import json
+import timeit
+
+benchmarks_directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(benchmarks_directory))
+
+import sublime_stub
+from package_tree import generate_preferences
+
+
+def legacy_get_descriptions(data):
+    """
+        The line based implementation replaced by `parse_settings()`
+    """
+    COMMENT_RE = re.compile(r"(?s)\s*//\s?(.*)")
+    COMMENT_RE2 = re.compile(r'''(?xs)
+        (?:
+            "(?:[^"\\]|\\.)*"
+            | (?:(?!//)[^"])
+        )+
+        (//.*)
+        ''')
+    COMMENT_START = re.compile(r"^\s*/\*(.*)")
+    COMMENT_END   = re.compile(r"(.*)\*/")
+    KEY_RE     = re.compile(r'\s*"([^"]+)"\s*:')
+    INDENT_RE = re.compile(r'^\s*')
+
+    description = {}
+    comment = ""
+    is_comment = False
+
+    for line in data.splitlines(1):
+
+        if is_comment:
+            m = COMMENT_END.search(line)
+
+            if m:
+                comment += m.group(1).rstrip()+"\n"
+                is_comment = False
+
+            else:
+                comment += line
+
+            continue
+
+        m = COMMENT_START.match(line)
+
+        if m:
+            is_comment = True
+            comment += m.group(1).rstrip()+"\n"
+            continue
+
+        m = COMMENT_RE.match(line)
+
+        if m:
+            s = m.group(1)
+
+            if not s: s = "\n"
+            comment += s
+            continue
+
+        m = COMMENT_RE2.match(line)
+
+        if m:
+            line = line[:m.start(1)].rstrip()+"\n"
+
+        if not line.strip(): # empty line resets current comment
+            comment = ""
+            continue
+
+        m = KEY_RE.match(line)
+
+        if m:
+
+            while comment.startswith('\n'):
+                comment = comment[1:]
+
+            indent = INDENT_RE.match(comment).group(0)
+
+            if indent:
+                comment = ''.join([ l.startswith(indent) and l[len(indent):] or l for l in comment.splitlines(1) ])
+            description[m.group(1)] = {"description": comment.replace("\r", "") or "No help available"}
+            comment = ""
+
+    return description
+
+
+def main(arguments):
+    sublime = sublime_stub.install()
+    import quick_settings
+
+    files = [ (path, open(path, 'r', encoding='utf-8').read()) for path in arguments ]
+
+    if not files:
+        files.append( ("generated Preferences.sublime-settings", generate_preferences()) )
+
+    for name, data in files:
+        values, descriptions, offsets = quick_settings.parse_settings(data)
+        streamed = quick_settings.parse_settings_lines(quick_settings.iterate_settings_lines(quick_settings.iterate_text_chunks(data)))
+
+        if descriptions != legacy_get_descriptions(data):
+            print("%s: the descriptions differ from the legacy implementation" % name)
+            return 1
+
+        if values != sublime.decode_value(data):
+            print("%s: the values differ from sublime.decode_value()" % name)
+            return 1
+
+        if streamed != (values, descriptions, offsets):
+            print("%s: the streamed files parser gives other results" % name)
+            return 1
+
+        # A native speed `decode_value()`, as the stub one removes the comments with regexes
+        uncommented = {data: sublime_stub.strip_comments(data)}
+        sublime.decode_value = lambda data: json.loads(uncommented[data])
+
+        try:
+            repeat = 20
+            legacy = min( timeit.repeat(lambda: (legacy_get_descriptions(data), sublime.decode_value(data)), number=1, repeat=repeat) )
+            single = min( timeit.repeat(lambda: quick_settings.parse_settings(data), number=1, repeat=repeat) )
+            python = min( timeit.repeat(lambda: quick_settings.parse_settings_lines(
+                    quick_settings.iterate_settings_lines(quick_settings.iterate_text_chunks(data))), number=1, repeat=repeat) )
+
+        finally:
+            sublime.decode_value = sublime_stub.decode_value
+
+        print("%s (%s lines, %s keys)" % (name, data.count("\n"), len( values )))
+        print("    get_descriptions + decode_value: %8.2f ms" % (legacy * 1000))
+        print("    parse_settings:                  %8.2f ms" % (single * 1000))
+        print("    speedup:                         %8.2fx" % (legacy / single))
+        print("    streamed files parser:           %8.2f ms" % (python * 1000))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
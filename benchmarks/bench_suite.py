@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+    Measure how each phase of building the settings panels scales, outside Sublime Text, on a
+    generated package tree. See `package_tree.generate_package_tree()`.
+
+    python3 benchmarks/bench_suite.py [--packages 40] [--keys 300] [--comment-density 0.67]
+                                      [--repeat 10] [--save-baseline] [--time-tolerance 1.0]
+                                      [--memory-tolerance 0.1]
+
+    Each phase reports its best time of `--repeat` runs and its peak traced memory. They are
+    compared against the baseline stored on `baselines.json` for the same tree shape, and the
+    exit status is 1 when any phase uses more memory than `--memory-tolerance` allows.
+
+    The memory usage does not change between runs, while the absolute times depend on the
+    machine and on its load. So each phase time is only reported relative to the
+    `parse_settings` phase measured on the same run, and it is only gated when a
+    `--time-tolerance` is given. Use `--save-baseline` to store the current results as the new
+    baseline.
+"""
+
+import os
+import sys
+import json
+import shutil
+import timeit
+import argparse
+import tempfile
+import tracemalloc
+
+benchmarks_directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(benchmarks_directory))
+
+import sublime_stub
+from package_tree import generate_package_tree
+
+baselines_file = os.path.join(benchmarks_directory, 'baselines.json')
+
+# The phase the other phases times are measured against
+reference_phase = "parse_settings"
+
+
+def get_phases(quick_settings, settings_files):
+    """
+        @return list: [(name, setup, run)] where `setup()` prepares the state measured by `run()`
+    """
+    cache_path = quick_settings.get_catalog_cache_path()
+    contents = [ open(path, 'r', encoding='utf-8').read() for path in settings_files ]
+
+    def no_setup():
+        pass
+
+    def remove_cache():
+
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+
+    def new_catalog():
+        quick_settings.settings_catalog = quick_settings.SettingsCatalog()
+        quick_settings.option_tables.clear()
+
+    def warm_catalog():
+        new_catalog()
+        quick_settings.settings_catalog.get_setting_file(quick_settings.default_preferences_file)
+
+    def built_catalog():
+        new_catalog()
+        quick_settings.settings_catalog.refresh()
+
+    def uncached_catalog():
+        remove_cache()
+        built_catalog()
+
+    def cached_catalog():
+        built_catalog()
+        load_resources()
+        built_catalog()
+
+    def load_resources():
+        catalog = quick_settings.settings_catalog
+        catalog.load_resources(catalog.resources)
+
+    def parse_files():
+
+        for data in contents:
+            quick_settings.parse_settings(data)
+
+    def run_command(**args):
+        window = sublime_stub.Window()
+        quick_settings.QuickSettingsEditPreferencesCommand(window).run(**args)
+        return window.panels[-1][0]
+
+    return \
+    [
+        ("parse_settings", no_setup, parse_files),
+        ("load_resources (no cache)", uncached_catalog, load_resources),
+        ("load_resources (cached)", cached_catalog, load_resources),
+        ("get_setting_names (new catalog)", new_catalog, lambda: quick_settings.settings_catalog.get_setting_names()),
+        ("run main panel", warm_catalog, run_command),
+        ("run Preferences panel (new catalog)", new_catalog, lambda: run_command(setting_file='Preferences')),
+        ("run Preferences panel (built)", lambda: run_command(setting_file='Preferences'), lambda: run_command(setting_file='Preferences')),
+    ]
+
+
+def measure_phase(setup, run, repeat):
+    """
+        @return dict: with the best time of `repeat` runs, and the peak memory traced on one more
+    """
+    seconds = min( timeit.repeat(run, setup, number=1, repeat=repeat) )
+
+    setup()
+    tracemalloc.start()
+
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+
+    tracemalloc.stop()
+    return {'seconds': seconds, 'peak_kib': peak / 1024}
+
+
+def load_baselines():
+
+    try:
+        with open(baselines_file, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def save_baselines(baselines):
+
+    with open(baselines_file, 'w', encoding='utf-8') as file:
+        json.dump(baselines, file, indent=4, sort_keys=True)
+        file.write("\n")
+
+
+def compare(result, baseline, reference, baseline_reference, time_tolerance, memory_tolerance):
+    """
+        @reference            the `reference_phase` result of the same run as `result`
+        @baseline_reference   the `reference_phase` result of the baseline
+
+        @return tuple: (text, is_regression) with the change from `baseline` to `result`
+    """
+
+    if not baseline or not baseline_reference:
+        return "no baseline", False
+
+    # How much slower the phase got compared to the parser on the same machine
+    time_ratio = ( result['seconds'] / max( reference['seconds'], 1e-9 ) ) \
+            / ( baseline['seconds'] / max( baseline_reference['seconds'], 1e-9 ) )
+
+    memory_ratio = result['peak_kib'] / max( baseline['peak_kib'], 1e-9 )
+    is_time_gated = time_tolerance is not None and result is not reference
+
+    is_regression = is_time_gated and time_ratio > 1 + time_tolerance or memory_ratio > 1 + memory_tolerance
+    time_text = "%5.2fx time" % time_ratio if result is not reference else " reference"
+
+    return "%s %5.2fx memory%s" % (time_text, memory_ratio, "  REGRESSION" if is_regression else ""), is_regression
+
+
+def main(arguments):
+    parser = argparse.ArgumentParser(description="Benchmark the settings panels phases on a generated package tree")
+    parser.add_argument('--packages', type=int, default=40)
+    parser.add_argument('--keys', type=int, default=300, help="settings for each package settings file")
+    parser.add_argument('--comment-density', type=float, default=0.67, help="ratio of the settings with a description")
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--time-tolerance', type=float, default=None,
+            help="also fail when a phase time grew more than this over the baseline, relative to the %s phase, as 1.0 for 100%%" % reference_phase)
+    parser.add_argument('--memory-tolerance', type=float, default=0.1, help="allowed memory growth over the baseline, as 0.1 for 10%%")
+    parser.add_argument('--save-baseline', action='store_true')
+    options = parser.parse_args(arguments)
+
+    tree_root = tempfile.mkdtemp(prefix='quick_settings_bench_')
+
+    try:
+        settings_files = generate_package_tree(tree_root, options.packages, options.keys, options.comment_density)
+
+        sublime_stub.install(tree_root)
+        import quick_settings
+
+        configuration = "packages=%s keys=%s comment_density=%s" % (options.packages, options.keys, options.comment_density)
+        baselines = load_baselines()
+        baseline = baselines.get(configuration, {})
+
+        results = {}
+        is_regression = False
+
+        print("%s (%s settings files)" % (configuration, len( settings_files )))
+
+        for name, setup, run in get_phases(quick_settings, settings_files):
+            results[name] = measure_phase(setup, run, options.repeat)
+
+            comparison, is_phase_regression = compare(results[name], baseline.get(name), results[reference_phase],
+                    baseline.get(reference_phase), options.time_tolerance, options.memory_tolerance)
+
+            is_regression |= is_phase_regression
+            print("    %-38s %9.2f ms %10.1f KiB   %s" % (name, results[name]['seconds'] * 1000, results[name]['peak_kib'], comparison))
+
+        if options.save_baseline:
+            baselines[configuration] = results
+            save_baselines(baselines)
+            print("Saved the baseline on %s" % baselines_file)
+            return 0
+
+        return 1 if is_regression else 0
+
+    finally:
+        shutil.rmtree(tree_root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
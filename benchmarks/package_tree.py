@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+    Generated settings files and package trees, with the shape of the ones shipped with
+    Sublime Text and the packages installed by Package Control.
+"""
+
+import os
+
+
+def generate_preferences(keys=1200, seed=7, comment_density=0.67):
+    """
+        A file with about the same size, comments and values mix of the Default package
+        `Preferences.sublime-settings`
+
+        @comment_density    the ratio of the settings with a description
+    """
+    lines = ["// Settings in here override those in \"Default/Preferences.sublime-settings\",", "{"]
+
+    for index in range(keys):
+        kind = ( index * seed ) % 9
+        is_commented = ( index * 37 ) % 100 < comment_density * 100
+
+        if is_commented and kind != 6:
+            lines.append("\t// Description of the setting number %s, which explains" % index)
+            lines.append("\t// what it does for \"some_value\" and http://example.com/path")
+
+        if is_commented and kind == 6:
+            lines.append("\t/* A block comment describing")
+            lines.append("\t   the setting number %s */" % index)
+
+        values = \
+        [
+            '%s' % index,
+            '"Packages/Color Scheme - Default/Setting %s.sublime-color-scheme"' % index,
+            'true',
+            'false',
+            '%s.5' % index,
+            '[80, 100, 120]',
+            '["draw_normal", "draw_active"]',
+            '{ "key": "value", "nested": [1, 2, { "deep": null }] }',
+            '"auto"',
+        ]
+
+        lines.append('\t"setting_%s": %s,%s' % (index, values[kind], " // trailing comment" if kind == 6 else ""))
+
+        if kind in (2, 5, 8):
+            lines.append("")
+
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def write_file(path, contents):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(contents)
+
+
+def generate_package_tree(root, packages=40, keys=300, comment_density=0.67):
+    """
+        Write a `Packages` directory under `root` with the `Default` and `User` packages, plus
+        `packages` packages. Each one has a settings file with `keys` settings, a platform
+        settings file, a syntax with its own settings file and a few other resources.
+
+        @return list: the paths of the settings files written
+    """
+    packages_path = os.path.join(root, 'Packages')
+    settings_files = []
+
+    def write_settings(package, name, contents):
+        path = os.path.join(packages_path, package, name + '.sublime-settings')
+        write_file(path, contents)
+        settings_files.append(path)
+
+    # The platform files repeat the first settings of the main ones
+    write_settings('Default', 'Preferences', generate_preferences(keys=keys * 4, comment_density=comment_density))
+    write_settings('Default', 'Preferences (Linux)', generate_preferences(keys=20, comment_density=comment_density))
+    write_settings('User', 'Preferences', generate_preferences(keys=20, seed=4, comment_density=0))
+
+    write_file(os.path.join(packages_path, 'Python', 'Python.sublime-syntax'), "name: Python\nscope: source.python\n")
+    write_settings('Python', 'Python', generate_preferences(keys=10, seed=5, comment_density=comment_density))
+
+    for index in range(packages):
+        package = 'Package %s' % index
+        seed = 7 + index % 5
+
+        write_settings(package, package, generate_preferences(keys=keys, seed=seed, comment_density=comment_density))
+        write_settings(package, package + ' (Linux)', generate_preferences(keys=min( keys, 15 ), seed=seed, comment_density=comment_density))
+
+        syntax = 'Syntax %s' % index
+        write_file(os.path.join(packages_path, package, syntax + '.sublime-syntax'), "name: %s\nscope: source.syntax%s\n" % (syntax, index))
+        write_settings(package, syntax, generate_preferences(keys=10, seed=5, comment_density=comment_density))
+
+        for name in ('plugin.py', 'Default.sublime-keymap', 'Main.sublime-menu', 'README.md'):
+            write_file(os.path.join(packages_path, package, name), "\n")
+
+    return settings_files
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+    Stand-in `sublime` and `sublime_plugin` modules, so `quick_settings` can be imported and
+    measured outside Sublime Text. The resources come from a package tree on the disk, as the
+    ones written by `package_tree.generate_package_tree()`.
+
+    import sublime_stub
+    sublime_stub.install("/tmp/tree")
+
+    import quick_settings
+"""
+
+import os
+import re
+import sys
+import json
+import types
+import fnmatch
+
+root = None
+KEEP_OPEN_ON_FOCUS_LOST = 2
+
+
+def strip_comments(data):
+    """
+        Stand-in for `sublime.decode_value()`, removing comments and trailing commas
+    """
+    data = re.sub(r'(?s)("(?:[^"\\]|\\.)*")|//[^\n]*|/\*.*?\*/', lambda match: match.group(1) or '', data)
+    return re.sub(r'(?s)("(?:[^"\\]|\\.)*")|,(\s*[\]}])', lambda match: match.group(1) or match.group(2), data)
+
+
+def platform():
+    return 'linux'
+
+
+def packages_path():
+    return os.path.join(root, 'Packages')
+
+
+def installed_packages_path():
+    return os.path.join(root, 'Installed Packages')
+
+
+def cache_path():
+    return os.path.join(root, 'Cache')
+
+
+def executable_path():
+    return os.path.join(root, 'bin', 'sublime_text')
+
+
+def find_resources(pattern):
+    resources = []
+    base = packages_path()
+
+    for directory, directories, files in os.walk(base):
+        directories.sort()
+
+        for file in sorted(files):
+
+            if fnmatch.fnmatch(file, pattern):
+                resources.append( 'Packages/' + os.path.relpath(os.path.join(directory, file), base).replace(os.sep, '/') )
+
+    return resources
+
+
+def load_resource(name):
+
+    with open(os.path.join(root, name), 'r', encoding='utf-8') as resource:
+        return resource.read()
+
+
+def decode_value(data):
+    return json.loads(strip_comments(data))
+
+
+def encode_value(value, pretty=False):
+    return json.dumps(value, indent=4 if pretty else None)
+
+
+class Settings(dict):
+
+    def get(self, key, default=None):
+        return dict.get(self, key, default)
+
+    def set(self, key, value):
+        self[key] = value
+
+    def has(self, key):
+        return key in self
+
+    def erase(self, key):
+        self.pop(key, None)
+
+    def add_on_change(self, key, callback):
+        pass
+
+    def clear_on_change(self, key):
+        pass
+
+
+loaded_settings = {}
+
+
+def load_settings(name):
+    return loaded_settings.setdefault(name, Settings())
+
+
+def save_settings(name):
+    pass
+
+
+def set_timeout(callback, delay=0):
+    callback()
+
+
+def set_timeout_async(callback, delay=0):
+    callback()
+
+
+def status_message(message):
+    pass
+
+
+def error_message(message):
+    print("error_message: %s" % message)
+
+
+class Region(object):
+
+    def __init__(self, a, b=None):
+        self.a = a
+        self.b = a if b is None else b
+
+
+def windows():
+    return []
+
+
+def active_window():
+    return None
+
+
+class View(object):
+    """
+        Records the commands run on it, instead of editing any text
+    """
+    last_id = 0
+
+    def __init__(self, window, syntax=None):
+        View.last_id += 1
+
+        self.view_id = View.last_id
+        self.parent = window
+        self.view_settings = Settings({'syntax': syntax or 'Packages/Python/Python.sublime-syntax'})
+        self.commands = []
+
+    def id(self):
+        return self.view_id
+
+    def window(self):
+        return self.parent
+
+    def settings(self):
+        return self.view_settings
+
+    def run_command(self, command, args=None):
+        self.commands.append( (command, args) )
+
+    def set_status(self, key, value):
+        pass
+
+    def erase_status(self, key):
+        pass
+
+    def show(self, point):
+        pass
+
+    def file_name(self):
+        return None
+
+    def size(self):
+        return 0
+
+
+class Window(object):
+    """
+        Records the quick panels and commands run on it, instead of showing anything
+    """
+
+    def __init__(self, syntax=None):
+        self.view = View(self, syntax)
+        self.panels = []
+        self.commands = []
+        self.project = {'folders': []}
+
+    def id(self):
+        return 1
+
+    def active_view(self):
+        return self.view
+
+    def views(self):
+        return [self.view]
+
+    def create_output_panel(self, name):
+        return View(self)
+
+    def show_quick_panel(self, items, on_done, flags=0, selected_index=-1, on_highlight=None):
+        self.panels.append( (items, on_done, on_highlight) )
+
+    def show_input_panel(self, caption, initial_text, on_done, on_change, on_cancel):
+        self.panels.append( (caption, on_done, on_change, on_cancel) )
+        return View(self)
+
+    def run_command(self, command, args=None):
+        self.commands.append( (command, args) )
+
+    def project_data(self):
+        return json.loads( json.dumps( self.project ) )
+
+    def set_project_data(self, data):
+        self.project = data
+
+
+class WindowCommand(object):
+
+    def __init__(self, window):
+        self.window = window
+
+
+class TextCommand(object):
+
+    def __init__(self, view):
+        self.view = view
+
+
+class EventListener(object):
+    pass
+
+
+def install(tree_root=None):
+    """
+        Register this module as `sublime`, and a `sublime_plugin` module with the commands base
+        classes, unless the real ones can be imported.
+
+        @tree_root  the directory with the `Packages` tree the resources are loaded from
+    """
+    global root
+    root = tree_root
+
+    try:
+        import sublime
+        return sublime
+
+    except ImportError:
+        pass
+
+    sublime_plugin = types.ModuleType('sublime_plugin')
+    sublime_plugin.WindowCommand = WindowCommand
+    sublime_plugin.TextCommand = TextCommand
+    sublime_plugin.EventListener = EventListener
+
+    sys.modules['sublime'] = sys.modules[__name__]
+    sys.modules['sublime_plugin'] = sublime_plugin
+    return sys.modules[__name__]
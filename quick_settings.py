@@ -4,6 +4,16 @@
 import os
 import re
 import sys
+import types
+import fnmatch
+import math
+import heapq
+import bisect
+import time
+import hashlib
+import itertools
+import threading
+import collections
 
 import pprint
 
@@ -11,8 +21,13 @@ import sublime
 import sublime_plugin
 
 
+import io
 import ast
+import copy
 import json
+import pstats
+import cProfile
+import importlib
 
 # # Import the debugger
 # from debug_tools import getLogger
@@ -47,8 +62,35 @@ command_name = "quick_settings_edit_preferences"
 standard_settings_types = ('default', 'default_'+sublime.platform(), 'user')
 standard_settings_names = ( distraction_free_file, current_syntax_file, current_project_file, this_view_file )
 
+# Their settings and defaults are the `Preferences` ones, only their values come from each window
+overlay_settings_names = ( this_view_file, current_project_file )
+
 last_access = {}
 main_function_key = 'main_function'
+search_function_key = 'search_function'
+
+# The settings files panels, built only again after their settings files change
+option_tables = {}
+
+# How many characters of each setting value are shown on the quick panel
+value_preview_length = 100
+
+# The syntax of the views editing the lists and dictionaries settings, when no package has a
+# `JSON.sublime-syntax`, which moved from the JavaScript package to the JSON one on Sublime Text 4
+default_json_syntax_file = "Packages/JavaScript/JSON.sublime-syntax"
+
+# The open `JsonValueEditor`s by their views ids
+value_editors = {}
+
+# Shared by all the settings without a description, instead of one copy for each of them
+no_help_description = sys.intern("No help available")
+
+# Bump this whenever the layout of the cached entries or the parser output changes
+catalog_cache_version = 2
+catalog_cache_file = 'preferences_catalog.json'
+
+# Written by `SettingsWriter` as the value of the settings to remove from their files
+erased_setting = object()
 
 
 def show_quick_panel(view, options, done, highlighted=None, last=-1):
@@ -65,6 +107,202 @@ def show_quick_panel(view, options, done, highlighted=None, last=-1):
     sublime.set_timeout(lambda: view.window().show_quick_panel(options, done, sublime.KEEP_OPEN_ON_FOCUS_LOST, last, highlighted), 10)
 
 
+json_encoder = json.JSONEncoder()
+
+
+def get_value_preview(value):
+    """
+        @return str: the JSON representation of `value`, truncated to `value_preview_length`
+                characters without serializing the whole value, when it is a big list or dict
+    """
+
+    if not isinstance(value, (list, dict)):
+        preview = json.dumps(value)
+
+    else:
+        chunks = []
+        length = 0
+
+        for chunk in json_encoder.iterencode(value):
+            chunks.append(chunk)
+            length += len(chunk)
+
+            if length > value_preview_length:
+                break
+
+        preview = "".join(chunks)
+
+    if len(preview) > value_preview_length:
+        return preview[:value_preview_length] + "..."
+
+    return preview
+
+
+class ProfileSpan(object):
+    """
+        Adds the time spent inside a `with` block to a phase of the current profile run
+    """
+
+    __slots__ = ('profiler', 'phase', 'started')
+
+    def __init__(self, profiler, phase):
+        self.profiler = profiler
+        self.phase = phase
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.profiler.add_time(self.phase, time.perf_counter() - self.started)
+
+
+class ProfileRun(object):
+    """
+        Times the phases of one command run, or of one catalog load, for `PhaseProfiler`
+    """
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.depth = 0
+        self.started = None
+        self.seconds = 0
+        self.phases = collections.OrderedDict()
+        self.counters = collections.OrderedDict()
+        self.profile = None
+        self.statistics = None
+
+    def __enter__(self):
+        self.profiler.start(self)
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.profiler.stop(self)
+
+
+class PhaseProfiler(object):
+    """
+        Keeps how long each phase of the last `quick_settings_profile_runs` runs took, and how
+        many files and settings they went through. They are shown by the
+        `quick_settings_profile_report` command.
+
+        When `quick_settings_profile` is enabled, each run is also captured by `cProfile`.
+    """
+
+    def __init__(self):
+        self.runs = collections.deque()
+        self.lock = threading.Lock()
+
+        # The runs of the panels on the main thread and of the warm up on the worker thread may
+        # overlap, so each thread has its own current run
+        self.local = threading.local()
+
+    def run(self, name):
+        """
+            @return a context manager timing all the phases run inside it, except when it is
+                    inside another run on the same thread, as a panel run loading the catalog
+        """
+        return ProfileRun(self, name)
+
+    def span(self, phase):
+        return ProfileSpan(self, phase)
+
+    def get_current(self):
+        """
+            @return ProfileRun: the run on the calling thread, or None
+        """
+        return getattr(self.local, 'run', None)
+
+    def start(self, run):
+        current = self.get_current()
+
+        if current is not None:
+            current.depth += 1
+            return
+
+        self.local.run = run
+
+        if sublime.load_settings('Preferences.sublime-settings').get('quick_settings_profile', False):
+            run.profile = cProfile.Profile()
+            run.profile.enable()
+
+        run.started = time.perf_counter()
+
+    def stop(self, run):
+        current = self.get_current()
+
+        if current.depth:
+            current.depth -= 1
+            return
+
+        self.local.run = None
+        current.seconds = time.perf_counter() - current.started
+
+        if current.profile:
+            current.profile.disable()
+
+            output = io.StringIO()
+            pstats.Stats(current.profile, stream=output).sort_stats('cumulative').print_stats(30)
+
+            current.statistics = output.getvalue()
+            current.profile = None
+
+        runs = max( 1, sublime.load_settings('Preferences.sublime-settings').get('quick_settings_profile_runs', 10) )
+
+        with self.lock:
+            self.runs.append(current)
+
+            while len( self.runs ) > runs:
+                self.runs.popleft()
+
+    def add_time(self, phase, seconds):
+        current = self.get_current()
+
+        if current is not None:
+            count, total = current.phases.get(phase, (0, 0))
+            current.phases[phase] = (count + 1, total + seconds)
+
+    def count(self, counter, amount=1):
+        current = self.get_current()
+
+        if current is not None:
+            current.counters[counter] = current.counters.get(counter, 0) + amount
+
+    def get_report(self, runs=None):
+        """
+            @runs   how many of the last runs to report, or all of them
+
+            @return str: the phases and counters of the last runs, the most recent first
+        """
+
+        with self.lock:
+            last_runs = list( self.runs )[::-1][:runs]
+
+        if not last_runs:
+            return "Quick Settings: No runs were profiled yet.\n"
+
+        lines = [ "Quick Settings: The last %s runs, the most recent first" % len( last_runs ), "" ]
+
+        for run in last_runs:
+            lines.append( "%s: %.2f ms" % (run.name, run.seconds * 1000) )
+
+            for phase, (count, seconds) in run.phases.items():
+                lines.append( "    %-32s %6s x %10.2f ms" % (phase, count, seconds * 1000) )
+
+            for counter, amount in run.counters.items():
+                lines.append( "    %-32s %6s" % (counter, amount) )
+
+            if run.statistics:
+                lines.append( "" )
+                lines.extend( "    " + line for line in run.statistics.strip().splitlines() )
+
+            lines.append( "" )
+
+        return "\n".join( lines )
+
+
+profiler = PhaseProfiler()
+
+
 def get_preference_name(file):
     return os.path.basename(file).rsplit('.', 1)[0]
 
@@ -91,6 +329,212 @@ def json_dict(x):
     return d
 
 
+def json_value(x):
+    return sublime.decode_value(x)
+
+
+def json_bool(x):
+    d = sublime.decode_value(x)
+
+    if not isinstance(d, bool):
+        raise ValueError("Expected true or false")
+
+    return d
+
+
+def json_number(x):
+    d = sublime.decode_value(x)
+
+    if isinstance(d, bool) or not isinstance(d, (int, float)):
+        raise ValueError("Expected a number")
+
+    return d
+
+
+# The validators which may be given by their names, and how the input text is converted
+# to the values checked by each `type` of a schema validator
+builtin_validators = \
+{
+    'str': str,
+    'int': int,
+    'float': float,
+    'number': json_number,
+    'bool': json_bool,
+    'list': json_list,
+    'dict': json_dict,
+    'json': json_value,
+    'json_list': json_list,
+    'json_dict': json_dict,
+}
+
+# The types of the values accepted by each `type`, as the list elements are not converted
+schema_types = \
+{
+    'str': str,
+    'int': int,
+    'float': (int, float),
+    'number': (int, float),
+    'bool': bool,
+    'list': list,
+    'dict': dict,
+    'json_list': list,
+    'json_dict': dict,
+}
+
+
+def compile_schema_check(schema):
+    """
+        @schema     dict: as {"type": "list", "items": {"type": "int", "minimum": 0}}, with the
+                    optional keys `type`, `enum`, `minimum`, `maximum`, `min_items`, `max_items`
+                    and `items`, the schema of each list element
+
+        @return function: which raises `ValueError` when the given value does not match `schema`
+    """
+    checks = []
+    value_type = schema.get('type')
+
+    if value_type in schema_types:
+        python_type = schema_types[value_type]
+        is_number = value_type in ('int', 'float', 'number')
+
+        def check_type(value):
+
+            if not isinstance(value, python_type) or is_number and isinstance(value, bool):
+                raise ValueError("Expected a value of type %s, not %s" % (value_type, json.dumps(value)))
+
+        checks.append(check_type)
+
+    if 'enum' in schema:
+        enum = schema['enum']
+
+        def check_enum(value):
+
+            if value not in enum:
+                raise ValueError("Value must be one of %s" % enum)
+
+        checks.append(check_enum)
+
+    for key, is_wrong, message in (
+            ('minimum', lambda value, limit: value < limit, "Value must be at least %s"),
+            ('maximum', lambda value, limit: value > limit, "Value must be at most %s"),
+            ('min_items', lambda value, limit: len( value ) < limit, "Expected at least %s elements"),
+            ('max_items', lambda value, limit: len( value ) > limit, "Expected at most %s elements")):
+
+        if key in schema:
+
+            def check_limit(value, limit=schema[key], is_wrong=is_wrong, message=message):
+
+                if is_wrong(value, limit):
+                    raise ValueError(message % limit)
+
+            checks.append(check_limit)
+
+    if 'items' in schema:
+        check_item = compile_schema_check(schema['items'])
+
+        def check_items(value):
+
+            for index, item in enumerate(value):
+
+                try:
+                    check_item(item)
+
+                except ValueError as error:
+                    raise ValueError("Element %s: %s" % (index, error))
+
+        checks.append(check_items)
+
+    def check(value):
+
+        for check_value in checks:
+            check_value(value)
+
+    return check
+
+
+def import_validator(validator_path):
+    """
+        @validator_path     str: as "Package Name.module.function"
+
+        @return function: the imported function, or one raising `ValueError` when it cannot be
+                imported, so the widget tells the user why the value is not accepted
+    """
+    module_name, _, function_name = validator_path.rpartition('.')
+
+    try:
+        return getattr(importlib.import_module(module_name), function_name)
+
+    except (ImportError, AttributeError, ValueError) as error:
+        print( "run_widget: Could not import the validator %s (%s)" % (validator_path, error) )
+
+        def missing_validator(value):
+            raise ValueError("The validator %s could not be imported" % validator_path)
+
+        return missing_validator
+
+
+def compile_validator(validate):
+    """
+        @validate   the `validate` of a `meta.<setting_name>` setting, as the name of a builtin
+                    validator, a "Package Name.module.function" path, a list with the accepted
+                    values, or a schema dictionary, see `compile_schema_check()`
+
+        @return function: converting the input text to the setting value, or raising `ValueError`
+    """
+
+    if isinstance(validate, list):
+        return compile_validator({'enum': validate, 'type': 'str'})
+
+    if isinstance(validate, dict):
+        parse = builtin_validators.get(validate.get('type'), json_value)
+        check = compile_schema_check(validate)
+
+        def validate_schema(value):
+            value = parse(value)
+            check(value)
+            return value
+
+        return validate_schema
+
+    if validate in builtin_validators:
+        return builtin_validators[validate]
+
+    if isinstance(validate, str) and '.' in validate:
+        return import_validator(validate)
+
+    print( "run_widget: Unknown validator %s" % json.dumps(validate) )
+    return str
+
+
+class ValidatorRegistry(object):
+    """
+        Compiles each validator only once, instead of on each widget opened. It is cleared on
+        each new catalog build, so the validators of upgraded packages are imported again.
+    """
+
+    def __init__(self):
+        self.validators = {}
+        self.lock = threading.Lock()
+
+    def get(self, validate):
+        key = json.dumps(validate, sort_keys=True)
+
+        with self.lock:
+
+            if key not in self.validators:
+                self.validators[key] = compile_validator(validate)
+
+            return self.validators[key]
+
+    def clear(self):
+
+        with self.lock:
+            self.validators.clear()
+
+
+validator_registry = ValidatorRegistry()
+
+
 def show_input(view, caption, initial, on_done=None, on_change=None, on_cancel=None, on_load=None):
     window = view.window()
 
@@ -108,244 +552,2105 @@ def show_input(view, caption, initial, on_done=None, on_change=None, on_cancel=N
     sublime.set_timeout(do_input, 10)
 
 
-def get_descriptions(data):
-    r"""get descriptions from preferences string
+def parse_settings(data):
+    r"""
+        Parse the contents of a settings file. The values are decoded by the native
+        `sublime.decode_value()`, while the descriptions and offsets are found on a single pass
+        over the lines, which does not decode the values again.
+
+        :param data:
+            string containing json preferences file, which may have comments and trailing commas.
+
+        @return tuple: (values, descriptions, offsets), where `values` is what
+                `sublime.decode_value()` returns, `descriptions` maps each key to its help text,
+                as {'word_wrap': {'description': 'Set to true to ...'}}, and `offsets` maps
+                each top level key to the position of its opening quote on `data`.
+    """
+    values = sublime.decode_value(data)
+    descriptions, offsets = parse_descriptions_lines(data.splitlines(True))
+
+    return values, descriptions, offsets
+
+
+def parse_settings_file(file_path):
+    """
+        Parse a settings file as `parse_settings()` does, reading it a chunk at a time, so the
+        whole file is never loaded at once. Then the values are decoded by `SettingsParser`, as
+        `sublime.decode_value()` needs the whole text.
+    """
+
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as settings_file:
+        return parse_settings_lines(iterate_settings_lines(iter(lambda: settings_file.read(settings_chunk_size), '')))
+
+
+# How many characters are split into lines at a time
+settings_chunk_size = 65536
+
+LINE_BREAKS = frozenset('\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029')
+
+
+def iterate_text_chunks(data):
+
+    for start in range(0, len( data ), settings_chunk_size):
+        yield data[start:start + settings_chunk_size]
+
+
+def iterate_settings_lines(chunks):
+    """
+        Split the text chunks on the same lines `str.splitlines(True)` splits their joined text,
+        while holding only one chunk, and the pieces of the line crossing the chunks, at a time.
+    """
+    held = []
+
+    for chunk in chunks:
+        lines = chunk.splitlines(True)
+
+        if held:
+
+            # A `\r` ending a chunk and a `\n` starting the next one are a single line ending
+            if held[-1][-1] != '\r' or lines[0] == '\n':
+                held.append( lines.pop(0) )
+
+            last = held[-1][-1]
+
+            if last in LINE_BREAKS and ( lines or last != '\r' ):
+                yield ''.join( held )
+                held = []
+
+        if lines:
+            last = lines.pop()
+
+            for line in lines:
+                yield line
 
-    extract descriptions from passed ``data``.
+            if last[-1] in LINE_BREAKS and last[-1] != '\r':
+                yield last
 
-    :param data:
-        string containing json preferences file.
+            else:
+                held = [last]
+
+    if held:
+        yield ''.join( held )
 
-    This is only a rough parser and will fetch also keys from
-    sub-dictionaries.  Calling function is responsible to
-    select correct data.
+
+def parse_settings_lines(lines):
     """
-    COMMENT_RE = re.compile(r"(?s)\s*//\s?(.*)")
-    COMMENT_RE2 = re.compile(r'''(?xs)
-        (?:
-            "(?:[^"\\]|\\.)*"
-            | (?:(?!//)[^"])
-        )+
-        (//.*)
-        ''')
-    COMMENT_START = re.compile(r"^\s*/\*(.*)")
-    COMMENT_END   = re.compile(r"(.*)\*/")
-    KEY_RE     = re.compile(r'\s*"([^"]+)"\s*:')
-    INDENT_RE = re.compile(r'^\s*')
+        Extract the values together with the keys descriptions and positions of a settings file,
+        so its contents are only scanned once. See `parse_settings()`.
+
+        The descriptions follow exactly the line based rules of the former `get_descriptions()`:
+        a key description is the block of comments right above it, which is reset by empty lines,
+        and it is also collected for keys of sub-dictionaries.
 
-    description = {}
-    comment = ""
+        @lines   an iterable with the file lines, keeping their line endings
+    """
+    descriptions = {}
+    comment = []
     is_comment = False
 
-    for line in data.splitlines(1):
+    parser = SettingsParser()
+    offsets = parser.offsets
+
+    # Lines are split by `str.splitlines()`, which also splits on characters which may be
+    # inside strings, so the values tokenizer only sees the text up to a line feed.
+    pending = []
+    line_offset = 0
+    values_offset = 0
+
+    for line in lines:
+        stripped = line.lstrip()
+        first = stripped[:1]
+        line_match = None
+
+        if not pending:
+            values_offset = line_offset
+
+        line_offset += len( line )
 
         if is_comment:
-            m = COMMENT_END.search(line)
+            end = line.rfind('*/')
 
-            if m:
-                comment += m.group(1).rstrip()+"\n"
+            if end > -1:
+                comment.append( line[:end].rstrip() + "\n" )
                 is_comment = False
 
             else:
-                comment += line
+                comment.append( line )
 
-            continue
+        elif not first: # empty line resets current comment
+            del comment[:]
 
-        m = COMMENT_START.match(line)
+        elif first == '/':
 
-        if m:
-            is_comment = True
-            comment += m.group(1).rstrip()+"\n"
-            continue
+            if stripped.startswith('/*'):
+                is_comment = True
+                comment.append( stripped[2:].rstrip() + "\n" )
 
-        m = COMMENT_RE.match(line)
+            elif stripped.startswith('//'):
+                text = stripped[2:]
 
-        if m:
-            s = m.group(1)
+                if text[:1].isspace():
+                    text = text[1:]
 
-            if not s: s = "\n"
-            comment += s
-            continue
+                comment.append( text or "\n" )
 
-        m = COMMENT_RE2.match(line)
+                # Nothing else to look for on this line
+                if not pending and not parser.is_block_comment and line.endswith('\n'):
+                    continue
 
-        if m:
-            #sys.stderr.write("line1: %s\n" % (repr(line)))
-            line = line[:m.start(1)].rstrip()+"\n"
-            #sys.stderr.write("line2: %s\n" % (repr(line)))
+        elif first == '"':
 
-        if not line.strip(): # empty line resets current comment
-            comment = ""
-            continue
+            if parser.state == EXPECT_KEY and not pending and not parser.is_block_comment and len( parser.stack ) == 1:
+                line_match = SETTINGS_LINE_RE.match(stripped)
 
-        m = KEY_RE.match(line)
+            if line_match and line_match.group('key'):
+                key = line_match.group('key')
 
-        if m:
+            else:
+                end = stripped.find('"', 1)
+                key = end > 1 and stripped[end+1:].lstrip()[:1] == ':' and stripped[1:end]
 
-            while comment.startswith('\n'):
-                comment = comment[1:]
+            if key:
+                descriptions[key] = get_key_description(comment)
+                del comment[:]
 
-            indent = INDENT_RE.match(comment).group(0)
+        if line_match:
+            string, literal, number, structure = line_match.group('string', 'literal', 'number', 'json')
 
-            if indent:
-                comment = ''.join([ l.startswith(indent) and l[len(indent):] or l for l in comment.splitlines(1) ])
-            description[m.group(1)] = {"description": comment.replace("\r", "") or "No help available"}
-            comment = ""
+            if string is not None:
+                value = string
 
-    return description
+            elif literal is not None:
+                value = SETTINGS_LITERALS[literal]
 
+            elif number is not None:
+                value = decode_number(number)
 
-# resolution order of settings
-#    Packages/Default/Preferences.sublime-settings
-#    Packages/Default/Preferences (<platform>).sublime-settings
-#    Packages/User/Preferences.sublime-settings
-#    <Project Settings>
-#    Packages/<syntax>/<syntax>.sublime-settings
-#    Packages/User/<syntax>.sublime-settings
-#    <Buffer Specific Settings>
+            else:
+                # Lists and dictionaries on a single line are usually plain JSON
+                value = decode_json(structure)
 
-def get_current_syntax(view, syntax=None):
-    current_syntax = None
-    settings = view.settings()
+                if value is None:
+                    line_match = None
 
-    if syntax:
-        current_syntax = syntax
+        if line_match:
+            key = line_match.group('key')
+            parser.stack[0][key] = value
+            offsets[key] = values_offset + len( line ) - len( stripped ) + line_match.start('key') - 1
 
-    elif settings.has('syntax'):
-        current_syntax = get_preference_name(settings.get('syntax'))
+            if not line_match.group('comma'):
+                parser.state = EXPECT_COMMA
 
-    return current_syntax
+        elif not line.endswith('\n'):
+            pending.append(line)
 
+        elif pending:
+            pending.append(line)
+            parser.feed(''.join(pending), values_offset)
+            del pending[:]
 
-def save_preference(view, setting_file, setting_name, value):
-    # log( 2, "save__preference" )
-    # log( 2, "save__preference, setting_file: " +  str( setting_file ) )
-    # log( 2, "save__preference, setting_name: " + str( setting_name ) )
-    # log( 2, "save__preference, value:        " +  str( value ) )
+        elif first or parser.is_block_comment:
+            parser.feed(line, values_offset)
 
-    if setting_file == this_view_file:
-        settings = view.settings()
-        settings.set(setting_name, value)
-        return
+    if pending:
+        parser.feed(''.join(pending), values_offset)
 
-    if setting_file == current_project_file:
-        data = view.window().project_data()
+    return parser.close(), descriptions, offsets
 
-        if 'settings' not in data:
-            data['settings'] = {}
 
-        data['settings'][setting_name] = value
-        view.window().set_project_data(data)
-        return
+def parse_descriptions_lines(lines):
+    """
+        Extract only the keys descriptions and positions of a settings file, following the
+        containers depth instead of decoding the values. See `parse_settings_lines()`.
 
-    setting_file = os.path.basename(setting_file)
+        @lines   an iterable with the file lines, keeping their line endings
+    """
+    descriptions = {}
+    offsets = {}
+    comment = []
+    is_comment = False
+    has_brackets = BRACKETS_SEARCH_RE.search
 
-    # log( 2, "save__preference, setting_file: " + setting_file )
-    settings = sublime.load_settings(setting_file+'.sublime-settings')
+    # The descriptions only take the comments starting a line, while any block comment may
+    # hide the brackets, so these are followed on their own
+    is_block_comment = False
+    depth = 0
+    line_offset = 0
 
-    settings.set(setting_name, value)
-    sublime.save_settings(setting_file+'.sublime-settings')
+    for line in lines:
+        stripped = line.lstrip()
+        first = stripped[:1]
+        line_offset += len( line )
 
+        if is_comment:
+            end = line.rfind('*/')
 
-def load_preferences():
-    # log( 2, "load__preferences" )
+            if end > -1:
+                comment.append( line[:end].rstrip() + "\n" )
+                is_comment = False
 
-    preferences = {}
-    preferences_files = sublime.find_resources("*.sublime-settings")
+            else:
+                comment.append( line )
 
-    for preference_file in preferences_files:
+        elif not first: # empty line resets current comment
+            del comment[:]
+            continue
 
-        # log( 2, "load__preferences, preference_file: {0}".format( preference_file ) )
-        preference_name = get_preference_name(preference_file)
+        elif first == '/':
 
-        # log( 2, "load__preferences, preference_name: {0}".format( preference_name ) )
-        platform = "any"
+            if stripped.startswith('/*'):
+                is_comment = True
+                comment.append( stripped[2:].rstrip() + "\n" )
 
-        if preference_name[-5:].lower() == "(osx)":
-            preference_name = preference_name[:-6]
-            platform = "osx"
+            elif stripped.startswith('//'):
+                text = stripped[2:]
 
-        elif preference_name[-9:].lower() == "(windows)":
-            preference_name = preference_name[:-10]
-            platform = "windows"
+                if text[:1].isspace():
+                    text = text[1:]
 
-        elif preference_name[-7:].lower() == "(linux)":
-            preference_name = preference_name[:-8]
-            platform = "linux"
+                comment.append( text or "\n" )
 
-        # log( 2, "load__preferences, preference_name: {0}".format( preference_name ) )
+                # Nothing else to look for on this line
+                if not is_block_comment:
+                    continue
 
-        if preference_name == "Base File":
-            preference_name = default_preferences_file
+        elif first == '"':
+            end = stripped.find('"', 1)
+            key = end > 1 and stripped[end+1:].lstrip()[:1] == ':' and stripped[1:end]
 
-        if preference_name == "Global":
-            preference_name = default_preferences_file
+            if key:
+                descriptions[key] = get_key_description(comment)
+                del comment[:]
 
-        if "/User/" in preference_file:
-            setting_type = "user"
+            if not is_block_comment:
 
-        else:
-            setting_type = "default"
+                if key and depth == 1:
+                    offsets[key] = line_offset - len( stripped )
 
-        if platform != "any":
-            setting_type = setting_type+"_"+platform
+                if has_brackets(stripped):
+                    change, is_block_comment = get_depth_change(stripped)
+                    depth += change
 
-        if preference_name not in preferences:
-            preferences[preference_name] = {}
+                continue
 
-        if setting_type not in preferences[preference_name]:
-            preferences[preference_name][setting_type] = {}
+        if is_block_comment:
+            end = stripped.find('*/')
 
-        #sys.stderr.write("preference_name: %s, setting_type: %s\n" % (preference_name, setting_type))
-        preference = preferences[preference_name][setting_type]
+            if end < 0:
+                continue
 
-        # log( 2, "preference: " + str( preference ) )
-        preference_data = sublime.load_resource(preference_file)
+            stripped = stripped[end+2:].lstrip()
+            is_block_comment = False
+
+        if depth == 1 and stripped[:1] == '"':
+            end = stripped.find('"', 1)
+
+            if end > 1 and stripped[end+1:].lstrip()[:1] == ':':
+                offsets[stripped[1:end]] = line_offset - len( stripped )
+
+        if has_brackets(stripped):
+            change, is_block_comment = get_depth_change(stripped)
+            depth += change
+
+    return descriptions, offsets
+
+
+def get_key_description(comment):
+    """
+        @return dict: the description entry of a key, from the comment lines above it
+    """
+    description = ''.join( comment ).lstrip('\n')
+    indent_length = len( description ) - len( description.lstrip() )
+
+    if indent_length:
+        indent = description[:indent_length]
+        description = ''.join([ l.startswith(indent) and l[indent_length:] or l for l in description.splitlines(True) ])
+
+    return {"description": description.replace("\r", "") or no_help_description}
+
+
+def get_depth_change(line):
+    """
+        @return tuple: (change, is_block_comment) with how many containers the line opens, minus
+                the ones it closes, and whether it ends inside a block comment
+    """
+    change = 0
+    is_block_comment = False
+
+    for match in BRACKETS_RE.finditer(line):
+        token = match.group()
+
+        if token in BRACKETS_DEPTH:
+            change += BRACKETS_DEPTH[token]
+
+        # The rest of the line is inside the comment
+        elif match.group('open_comment'):
+            is_block_comment = True
+            break
+
+    return change, is_block_comment
+
+
+SETTINGS_TOKEN_RE = re.compile(r'''(?x)
+    \s+
+    | (?P<punctuation>[{}\[\]:,])
+    | (?P<string>"(?:[^"\\\n]|\\.)*")
+    | (?P<number>-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+    | (?P<literal>true|false|null)
+    | (?P<line_comment>//)
+    | (?P<block_comment>/\*(?:[\s\S]*?(?P<block_end>\*/)|[\s\S]*))
+    | (?P<error>[\s\S])
+    ''')
+
+# Most lines are a top level `"key": value,` pair, which are parsed with a single match
+SETTINGS_LINE_RE = re.compile(r'''(?x)
+    "(?P<key>[^"\\\n]*)"[ \t]*:[ \t]*
+    (?:
+        "(?P<string>[^"\\\n]*)"
+        | (?P<literal>true|false|null)
+        | (?P<number>-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+        | (?P<json>[\[{].*[\]}])
+    )
+    [ \t]*(?P<comma>,?)[ \t]*(?://.*)?\r?\n?\Z
+    ''')
+
+SETTINGS_LITERALS = {'true': True, 'false': False, 'null': None}
+
+# The brackets outside the strings and comments of a line
+BRACKETS_RE = re.compile(r'"(?:[^"\\\n]|\\.)*"|//.*|/\*.*?\*/|(?P<open_comment>/\*)|[{}\[\]]')
+BRACKETS_DEPTH = {'{': 1, '[': 1, '}': -1, ']': -1}
+
+# Whether a line has anything for `BRACKETS_RE` to follow
+BRACKETS_SEARCH_RE = re.compile(r'[{}\[\]]|/\*')
+
+# The parser states, i.e., what the innermost container accepts next
+EXPECT_KEY   = 0 # a key or the container end, when it is a dictionary
+EXPECT_COLON = 1
+EXPECT_VALUE = 2 # a value, or the container end when it is a list
+EXPECT_MEMBER_VALUE = 3
+EXPECT_COMMA = 4 # a comma or the container end
+
+
+def decode_number(token):
+
+    if '.' in token or 'e' in token or 'E' in token:
+        return float(token)
+
+    return int(token)
+
+
+def reject_constant(constant):
+    raise ValueError("Invalid constant %s" % constant)
+
+
+def decode_json(text):
+    """
+        @return the decoded list or dictionary, or None when `text` is not strict JSON
+    """
+
+    try:
+        return json.loads(text, parse_constant=reject_constant)
+
+    except ValueError:
+        return None
+
+
+def decode_string(token):
+
+    if '\\' in token:
+        return json.loads(token, strict=False)
+
+    return token[1:-1]
+
+
+class SettingsParser(object):
+    """
+        Incremental tokenizer and parser for the values of a settings file, which may have
+        comments and trailing commas as `sublime.decode_value()` accepts.
+    """
+
+    def __init__(self):
+        self.offsets = {}
+
+        self.key = None
+        self.root = []
+        self.stack = []
+        self.state = EXPECT_VALUE
+        self.is_block_comment = False
+
+    def close(self):
+
+        if self.stack or not self.root:
+            raise ValueError("Unexpected end of the settings file")
+
+        return self.root[0]
+
+    def feed(self, text, text_offset):
+        """
+            @text          some complete lines of the settings file
+            @text_offset   the position of `text` on the file, for the keys offsets
+        """
+        position = 0
+
+        if self.is_block_comment:
+            position = text.find('*/')
+
+            if position < 0:
+                return
+
+            position += 2
+            self.is_block_comment = False
+
+        for match in SETTINGS_TOKEN_RE.finditer(text, position):
+            kind = match.lastgroup
+
+            if kind is None:
+                continue
+
+            if kind == 'line_comment':
+                # Skip to the next line, as `text` may have several of them
+                end = text.find('\n', match.end())
+
+                if end < 0:
+                    return
+
+                self.feed(text[end:], text_offset + end)
+                return
+
+            if kind == 'block_comment':
+
+                if match.group('block_end') is None:
+                    self.is_block_comment = True
+
+                continue
+
+            if kind == 'error':
+                self.raise_unexpected(match, text_offset)
+
+            token = match.group()
+
+            if kind == 'string':
+
+                if self.state == EXPECT_KEY:
+                    self.key = decode_string(token)
+
+                    if len( self.stack ) == 1:
+                        self.offsets[self.key] = text_offset + match.start()
+
+                    self.state = EXPECT_COLON
+                    continue
+
+                self.add_value(decode_string(token), match, text_offset)
+
+            elif kind == 'number':
+                self.add_value(decode_number(token), match, text_offset)
+
+            elif kind == 'literal':
+                self.add_value(SETTINGS_LITERALS[token], match, text_offset)
+
+            elif token == '{' or token == '[':
+                container = {} if token == '{' else []
+                self.add_value(container, match, text_offset)
+
+                self.stack.append(container)
+                self.state = EXPECT_KEY if token == '{' else EXPECT_VALUE
+
+            elif token == '}' or token == ']':
+                container = self.stack[-1] if self.stack else None
+
+                if token == '}':
+                    is_valid = isinstance(container, dict) and self.state in (EXPECT_KEY, EXPECT_COMMA)
+
+                else:
+                    is_valid = isinstance(container, list) and self.state in (EXPECT_VALUE, EXPECT_COMMA)
+
+                if not is_valid:
+                    self.raise_unexpected(match, text_offset)
+
+                self.stack.pop()
+                self.state = EXPECT_COMMA
+
+            elif token == ':':
+
+                if self.state != EXPECT_COLON:
+                    self.raise_unexpected(match, text_offset)
+
+                self.state = EXPECT_MEMBER_VALUE
+
+            else:
+
+                if self.state != EXPECT_COMMA or not self.stack:
+                    self.raise_unexpected(match, text_offset)
+
+                self.state = EXPECT_KEY if isinstance(self.stack[-1], dict) else EXPECT_VALUE
+
+    def add_value(self, value, match, text_offset):
+
+        if not self.stack:
+
+            if self.root:
+                self.raise_unexpected(match, text_offset)
+
+            self.root.append(value)
+
+        elif self.state == EXPECT_MEMBER_VALUE:
+            self.stack[-1][self.key] = value
+
+        elif self.state == EXPECT_VALUE and isinstance(self.stack[-1], list):
+            self.stack[-1].append(value)
+
+        else:
+            self.raise_unexpected(match, text_offset)
+
+        self.state = EXPECT_COMMA
+
+    def raise_unexpected(self, match, text_offset):
+        raise ValueError("Unexpected %r at position %s" % (match.group(), text_offset + match.start()))
+
+
+# resolution order of settings
+#    Packages/Default/Preferences.sublime-settings
+#    Packages/Default/Preferences (<platform>).sublime-settings
+#    Packages/User/Preferences.sublime-settings
+#    <Project Settings>
+#    Packages/<syntax>/<syntax>.sublime-settings
+#    Packages/User/<syntax>.sublime-settings
+#    <Buffer Specific Settings>
+
+def get_current_syntax(view, syntax=None):
+    current_syntax = None
+    settings = view.settings()
+
+    if syntax:
+        current_syntax = syntax
+
+    elif settings.has('syntax'):
+        current_syntax = get_preference_name(settings.get('syntax'))
+
+    return current_syntax
+
+
+def save_preference(view, setting_file, setting_name, value):
+    # log( 2, "save__preference" )
+    # log( 2, "save__preference, setting_file: " +  str( setting_file ) )
+    # log( 2, "save__preference, setting_name: " + str( setting_name ) )
+    # log( 2, "save__preference, value:        " +  str( value ) )
+
+    if setting_file == this_view_file:
+        settings = view.settings()
+        settings.set(setting_name, value)
+        override_index.update(('view', view.id()), setting_name, value)
+        return
+
+    if setting_file == current_project_file:
+        settings_writer.set_project(view.window(), setting_name, value)
+        override_index.update(('project', view.window().id()), setting_name, value)
+        return
+
+    setting_file = os.path.basename(setting_file)
+
+    # log( 2, "save__preference, setting_file: " + setting_file )
+    settings_writer.set(setting_file, setting_name, value)
+    override_index.update(setting_file, setting_name, value)
+
+
+def get_write_delay():
+    return sublime.load_settings('Preferences.sublime-settings').get('quick_settings_write_delay', 2000)
+
+
+def is_same_value(value, other):
+    """
+        Compare two settings values, without taking `True` as the same as `1`
+    """
+
+    if value != other:
+        return False
+
+    return json.dumps(value, sort_keys=True) == json.dumps(other, sort_keys=True)
+
+
+class SettingsWriter(object):
+    """
+        Collects the changes to the settings files and projects, writing each one only once after
+        the user stops changing settings for `quick_settings_write_delay` milliseconds, or closes
+        the panel. The changes which would not change the current value are not written at all.
+    """
+
+    def __init__(self):
+        self.pending = collections.OrderedDict()
+        self.pending_projects = collections.OrderedDict()
+        self.generation = 0
+
+        # Counts the flushes, so the panels know when their snapshots of the settings are old
+        self.flushes = 0
+
+    def set(self, setting_file, setting_name, value):
+        """
+            @setting_file   the settings file name, without the extension, as `Preferences`
+        """
+        self.pending.setdefault(setting_file, collections.OrderedDict())[setting_name] = value
+        self.schedule_flush()
+
+    def get(self, setting_file, setting_name, default=None):
+        """
+            @return the value waiting to be written for the given setting, or `default`
+        """
+        return self.pending.get(setting_file, {}).get(setting_name, default)
+
+    def set_project(self, window, setting_name, value):
+        changes = self.pending_projects.setdefault(window.id(), (window, collections.OrderedDict()))[1]
+        changes[setting_name] = value
+        self.schedule_flush()
+
+    def get_project(self, window, setting_name, default=None):
+        """
+            @return the value waiting to be written for the given project setting, or `default`
+        """
+        changes = self.pending_projects.get(window.id(), (window, {}))[1]
+        return changes.get(setting_name, default)
+
+    def set_batch(self, changes):
+        """
+            Write the given changes right away, together with the ones already waiting, so each
+            settings file is written only once.
+
+            @changes    {'Preferences': {'font_size': 18, 'word_wrap': erased_setting}, ...}
+            @return list: the names of the settings files changed
+        """
+
+        for setting_file, settings in changes.items():
+            self.pending.setdefault(setting_file, collections.OrderedDict()).update(settings)
+
+        # The scheduled flush would find nothing left to write
+        self.generation += 1
+        return self.flush()
+
+    def schedule_flush(self):
+        self.generation += 1
+        generation = self.generation
+
+        def flush():
+
+            # Some other change was made after this one, so wait for its own timer
+            if generation == self.generation:
+                self.flush()
+
+        sublime.set_timeout(flush, get_write_delay())
+
+    def flush(self):
+        """
+            @return list: the names of the settings files changed
+        """
+        changed_files = []
+        self.flushes += 1
+
+        pending = self.pending
+        self.pending = collections.OrderedDict()
+
+        for setting_file, changes in pending.items():
+            file_name = setting_file + '.sublime-settings'
+            settings = sublime.load_settings(file_name)
+            is_changed = False
+
+            for setting_name, value in changes.items():
+
+                if value is erased_setting:
+
+                    if settings.has(setting_name):
+                        settings.erase(setting_name)
+                        is_changed = True
+
+                    continue
+
+                if settings.has(setting_name) and is_same_value(settings.get(setting_name), value):
+                    continue
+
+                settings.set(setting_name, value)
+                is_changed = True
+
+            if is_changed:
+                sublime.save_settings(file_name)
+                settings_catalog.invalidate_resource("Packages/User/%s" % file_name)
+                changed_files.append(setting_file)
+
+        pending_projects = self.pending_projects
+        self.pending_projects = collections.OrderedDict()
+
+        for window, changes in pending_projects.values():
+            data = window.project_data() or {}
+            project_settings = data.setdefault('settings', {})
+            is_changed = False
+
+            for setting_name, value in changes.items():
+
+                if setting_name in project_settings and is_same_value(project_settings[setting_name], value):
+                    continue
+
+                project_settings[setting_name] = value
+                is_changed = True
+
+            # Each call copies the whole project structure, so it is only called once
+            if is_changed:
+                window.set_project_data(data)
+
+        return changed_files
+
+
+settings_writer = SettingsWriter()
+
+
+class OverrideIndex(object):
+    """
+        Which settings of each settings file, project and view have values different from their
+        defaults. They are found when a panel first needs them, and then kept up to date by
+        `save_preference()`, so they are not found again after each change.
+
+        The settings files are keyed by their names, as `Preferences`, while the projects and
+        views are keyed by `('project', window.id())` and `('view', view.id())`.
+    """
+
+    # Only the last used projects and views are kept. The views are also dropped when they are
+    # closed, see `QuickSettingsCatalogListener.on_close()`, but the projects are never told to be
+    # closed
+    max_entries = 100
+
+    def __init__(self):
+        self.entries = collections.OrderedDict()
+
+    def get(self, key, source):
+        """
+            @source     what the overridden settings were found from, as the setting index of a
+                        settings file, which outdates them when it changes, or a tuple with all
+                        of them
+
+            @return set: the names of the overridden settings, or None when they are not known
+        """
+        entry = self.entries.get(key)
+
+        if entry is not None and ( entry[0] is source or entry[0] == source ):
+            return entry[2]
+
+        return None
+
+    def set(self, key, source, setting_index, names):
+        """
+            @setting_index  the settings defaults, as a mapping to their `ResolvedSetting`
+            @names          the names of the overridden settings
+        """
+        self.entries.pop(key, None)
+        self.entries[key] = (source, setting_index, names)
+
+        while len( self.entries ) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def discard(self, key):
+        self.entries.pop(key, None)
+
+    def update(self, key, setting_name, value):
+        entry = self.entries.get(key)
+
+        if entry is not None:
+            source, setting_index, names = entry
+            resolved = setting_index.get(setting_name)
+
+            if resolved is not None and is_same_value(value, resolved.default):
+                names.discard(setting_name)
+
+            else:
+                names.add(setting_name)
+
+
+override_index = OverrideIndex()
+
+
+def get_setting_profiles():
+    """
+        @return dict: the `quick_settings_profiles` setting, as
+                      {'presentation': {'Preferences': {'font_size': 18}, 'Python': {...}}, ...}
+    """
+    profiles = sublime.load_settings('Preferences.sublime-settings').get('quick_settings_profiles', {})
+    return profiles if isinstance(profiles, dict) else {}
+
+
+def get_profile_state_path():
+    return os.path.join(sublime.packages_path(), "User", "QuickSettings", "active_profile.json")
+
+
+def load_profile_state():
+    """
+        @return dict: {'name': 'presentation', 'replaced': {'Preferences': {'font_size': [12]}}}
+                      with the values the active profile replaced, as `[]` for the settings
+                      which were not set, or an empty dict when no profile is active
+    """
+
+    try:
+        with open(get_profile_state_path(), 'r', encoding='utf-8') as state_file:
+            state = json.load(state_file)
+
+        if isinstance(state.get('replaced'), dict):
+            return state
+
+    except (IOError, OSError, ValueError, AttributeError):
+        pass
+
+    return {}
+
+
+def save_profile_state(state):
+    state_path = get_profile_state_path()
+    temporary_path = state_path + '.tmp'
+
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+
+    with open(temporary_path, 'w', encoding='utf-8') as state_file:
+        json.dump(state, state_file, indent=4, sort_keys=True)
+
+    os.replace(temporary_path, state_path)
+
+
+def get_restore_changes(replaced):
+    """
+        @return dict: the changes writing back the values replaced by a profile
+    """
+    changes = {}
+
+    for setting_file, settings in replaced.items():
+        changes[setting_file] = collections.OrderedDict(
+                (setting_name, value[0] if value else erased_setting) for setting_name, value in settings.items() )
+
+    return changes
+
+
+def write_profile_changes(changes):
+    """
+        Write the changes of a profile as one batch, telling the user about them only once
+    """
+    changed_files = settings_writer.set_batch(changes)
+
+    for setting_file in changes:
+        override_index.discard(setting_file)
+
+    return changed_files
+
+
+def apply_setting_profile(profile_name, profile):
+    """
+        Set all the settings of `profile` on their settings files, writing each one only once.
+        When other profile is active, its replaced values are restored on the same batch, so
+        reverting this one goes back to the values before any profile was applied.
+
+        @profile    {'Preferences': {'font_size': 18}, 'Distraction Free': {...}, ...}
+        @return list: the names of the settings files changed
+    """
+    state = load_profile_state()
+    previous = state.get('replaced', {})
+
+    changes = get_restore_changes(previous)
+    replaced = copy.deepcopy(previous)
+
+    for setting_file, settings in profile.items():
+
+        if not isinstance(settings, dict):
+            print( "apply_setting_profile: Skipping `%s` on the profile `%s`, as it is not a dictionary" % (setting_file, profile_name) )
+            continue
+
+        # The merged `sublime.load_settings()` also has the defaults, so only the User file
+        # written by `sublime.save_settings()` tells which settings were not set
+        user_settings = settings_catalog.get_setting_file(setting_file).get('user', {})
+        file_replaced = replaced.setdefault(setting_file, {})
+        file_changes = changes.setdefault(setting_file, collections.OrderedDict())
+
+        for setting_name, value in settings.items():
+
+            if setting_name not in file_replaced:
+                current = [user_settings[setting_name].value] if setting_name in user_settings else []
+                pending = settings_writer.get(setting_file, setting_name, current)
+
+                file_replaced[setting_name] = current if pending is current else [pending]
+
+            file_changes[setting_name] = value
+
+    # Saved first, so the replaced values are not lost when the settings files cannot be written
+    save_profile_state({'name': profile_name, 'replaced': replaced})
+    return write_profile_changes(changes)
+
+
+def revert_setting_profile():
+    """
+        Restore the values replaced by the active profile, writing each settings file only once
+
+        @return tuple: (profile_name, changed_files), or (None, []) when no profile is active
+    """
+    state = load_profile_state()
+
+    if not state:
+        return None, []
+
+    changed_files = write_profile_changes( get_restore_changes( state['replaced'] ) )
+    os.remove( get_profile_state_path() )
+
+    return state.get('name'), changed_files
+
+
+def get_preference_layer(preference_file):
+    """
+        Given a resource path as `Packages/Default/Preferences (Linux).sublime-settings`, returns
+        the tuple `(preference_name, setting_type)` where it must be merged, i.e., for the
+        example, `('Preferences', 'default_linux')`.
+    """
+    preference_name = get_preference_name(preference_file)
+    platform = "any"
+
+    if preference_name[-5:].lower() == "(osx)":
+        preference_name = preference_name[:-6]
+        platform = "osx"
+
+    elif preference_name[-9:].lower() == "(windows)":
+        preference_name = preference_name[:-10]
+        platform = "windows"
+
+    elif preference_name[-7:].lower() == "(linux)":
+        preference_name = preference_name[:-8]
+        platform = "linux"
+
+    if preference_name == "Base File":
+        preference_name = default_preferences_file
+
+    if preference_name == "Global":
+        preference_name = default_preferences_file
+
+    if "/User/" in preference_file:
+        setting_type = "user"
+
+    else:
+        setting_type = "default"
+
+    if platform != "any":
+        setting_type = setting_type+"_"+platform
+
+    return preference_name, setting_type
+
+
+class SettingRecord(object):
+    """
+        One setting of a settings file layer. The plugin host keeps thousands of them for as long
+        as Sublime Text is open, so they have no `__dict__`, and their names and descriptions are
+        interned, as the same ones repeat on the default, platform and user layers.
+    """
+
+    __slots__ = ('value', 'description')
+
+    def __init__(self, value, description=no_help_description):
+        self.value = value
+        self.description = description
+
+    def __repr__(self):
+        return "SettingRecord(%r, %r)" % (self.value, self.description)
+
+    def __eq__(self, other):
+        return isinstance(other, SettingRecord) and (self.value, self.description) == (other.value, other.description)
+
+    def __ne__(self, other):
+        return not self == other
+
+
+def make_setting_records(settings):
+    """
+        @settings   dict: {'setting_name': [value, description]}, as saved on the catalog cache
+
+        @return dict: {'setting_name': SettingRecord} with the names and descriptions interned
+    """
+    intern = sys.intern
+    return dict( (intern(setting_name), SettingRecord(value, intern(description))) for setting_name, (value, description) in settings.items() )
+
+
+def encode_setting_record(record):
+    """
+        Serialize the `SettingRecord` on the catalog cache as `[value, description]`
+    """
+
+    if isinstance(record, SettingRecord):
+        return [record.value, record.description]
+
+    raise TypeError("%r is not JSON serializable" % record)
+
+
+def parse_preference_resource(preference_file, preference_data, file_path=None):
+    """
+        Extract the settings and their descriptions from the `preference_data` contents, or
+        from the file on `file_path`, which is parsed while it is read.
+
+        @return dict: {'setting_name': SettingRecord(True, 'No help available')}
+    """
+    preference_settings = {}
+
+    try:
+
+        if file_path:
+            preference_data, description, offsets = parse_settings_file(file_path)
+
+        else:
+            preference_data, description, offsets = parse_settings(preference_data)
+
+        for setting_name, setting_value in preference_data.items():
+
+            if setting_name not in description:
+                preference_settings[sys.intern(setting_name)] = SettingRecord(setting_value)
+
+            else:
+                setting_description = sys.intern(description[setting_name]['description'])
+                preference_settings[sys.intern(setting_name)] = SettingRecord(setting_value, setting_description)
+
+    except:
+        print( "parse_preference_resource: Error reading %s (preference_data is %s)" % (preference_file, file_path or preference_data) )
+
+    return preference_settings
+
+
+def get_catalog_cache_path():
+    return os.path.join(sublime.cache_path(), "QuickSettings", catalog_cache_file)
+
+
+def load_catalog_cache():
+    """
+        Read the parsed settings saved by the last session, or an empty cache when there is
+        none or it was written by an incompatible version of this plugin.
+    """
+
+    try:
+        with open(get_catalog_cache_path(), 'r', encoding='utf-8') as cache_file:
+            cache = json.load(cache_file)
+
+        if cache.get('version') == catalog_cache_version and isinstance(cache.get('entries'), dict):
+            entries = cache['entries']
+
+            for entry in entries.values():
+                entry['settings'] = make_setting_records(entry['settings'])
+
+            return entries
+
+    except (IOError, OSError, ValueError, TypeError, KeyError, AttributeError):
+        pass
+
+    return {}
+
+
+def save_catalog_cache(entries):
+    cache_path = get_catalog_cache_path()
+    temporary_path = cache_path + '.tmp'
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+        with open(temporary_path, 'w', encoding='utf-8') as cache_file:
+            json.dump({'version': catalog_cache_version, 'entries': entries}, cache_file, default=encode_setting_record)
+
+        # Replace the old file only after the new one is complete, so a crash does not corrupt it
+        os.replace(temporary_path, cache_path)
+
+    except (IOError, OSError, TypeError, ValueError) as error:
+        print( "save_catalog_cache: Could not save the settings cache %s (%s)" % (cache_path, error) )
+
+
+def get_resource_fingerprint(preference_file):
+    """
+        Cheap fingerprint of the file backing a resource, without loading it. The loose file on
+        the `Packages` directory overrides the `Installed Packages` archive, which overrides the
+        archive shipped with Sublime Text, so they are checked on this same order.
+
+        @return list: [source_path, size, mtime] or None when the source file cannot be found
+    """
+    relative_path = preference_file[len("Packages/"):]
+    package_name = relative_path.split('/', 1)[0]
+
+    candidates = \
+    [
+        os.path.join(sublime.packages_path(), relative_path),
+        os.path.join(sublime.installed_packages_path(), package_name + '.sublime-package'),
+        os.path.join(os.path.dirname(sublime.executable_path()), 'Packages', package_name + '.sublime-package'),
+    ]
+
+    for candidate in candidates:
+
+        try:
+            status = os.stat(candidate)
+            return [candidate, status.st_size, status.st_mtime]
+
+        except OSError:
+            pass
+
+    return None
+
+
+def get_content_fingerprint(preference_data):
+    return ['sha1', hashlib.sha1(preference_data.encode('utf-8')).hexdigest()]
+
+
+def get_streamed_file(fingerprint):
+    """
+        The files unpacked on the `Packages` directory are read while they are parsed, so the big
+        ones are never loaded at once
+
+        @return str: the path to read the settings file from, or None to load it as a resource
+    """
+
+    if fingerprint and fingerprint[1] and not fingerprint[0].endswith('.sublime-package'):
+        return fingerprint[0]
+
+    return None
+
+
+def load_preference_data(preference_file, fingerprint):
+    """
+        Load the contents of one settings file which is not streamed
+
+        @return str: the resource contents, or None when it is read while parsed
+    """
+
+    if get_streamed_file(fingerprint):
+        return None
+
+    with profiler.span("load_resource"):
+        return sublime.load_resource(preference_file)
+
+
+def load_preference_entry(preference_file, cached_entry, fingerprint, preference_data):
+    """
+        Parse one settings file, loaded by `load_preference_data()`
+
+        @return tuple: (entry, is_changed) with the entry to keep on the catalog cache
+    """
+    file_path = get_streamed_file(fingerprint)
+
+    # When the resource source cannot be found, the cache is still valid if the contents did not change
+    if fingerprint is None:
+        fingerprint = get_content_fingerprint(preference_data or "")
+
+        if cached_entry and cached_entry.get('fingerprint') == fingerprint:
+            return cached_entry, False
+
+    preference_settings = {}
+
+    if file_path or preference_data:
+
+        with profiler.span("parse_settings"):
+            preference_settings = parse_preference_resource(preference_file, preference_data, file_path)
+
+        profiler.count("files parsed")
+        profiler.count("settings parsed", len( preference_settings ))
+
+    return {'fingerprint': fingerprint, 'settings': preference_settings}, True
+
+
+def load_preference_entries(preferences_files, cached_entries):
+    """
+        Load the given settings files, reusing the cached results for the files which did not
+        change since they were parsed. See `get_resource_fingerprint()`.
+
+        @preferences_files    the resources to load
+        @cached_entries       the entries returned by the last call, or by `load_catalog_cache()`
+
+        @return tuple: (entries, is_changed) with the entries of `preferences_files`
+    """
+    fresh_entries = {}
+    loading_files = []
+
+    with profiler.span("check fingerprints"):
+
+        for preference_file in preferences_files:
+            cached_entry = cached_entries.get(preference_file)
+            fingerprint = get_resource_fingerprint(preference_file)
+
+            if fingerprint is None or not cached_entry or cached_entry.get('fingerprint') != fingerprint:
+                loading_files.append( (preference_file, cached_entry, fingerprint) )
+
+            else:
+                fresh_entries[preference_file] = cached_entry
+
+    profiler.count("files from the cache", len( fresh_entries ))
+
+    is_changed = False
+
+    for preference_file, cached_entry, fingerprint in loading_files:
+        preference_data = load_preference_data(preference_file, fingerprint)
+        fresh_entries[preference_file], is_entry_changed = load_preference_entry(preference_file, cached_entry, fingerprint, preference_data)
+        is_changed |= is_entry_changed
+
+    return fresh_entries, is_changed
+
+
+def merge_preference_entries(preferences_files, entries):
+    """
+        Merge the settings files on the `find_resources()` order, so the latter packages override
+        the former ones.
+
+        @return dict: {'Preferences': {'default': {'word_wrap': SettingRecord('auto', '...')}}}
+    """
+    preferences = {}
+
+    for preference_file in preferences_files:
+
+        # log( 2, "load__preferences, preference_file: {0}".format( preference_file ) )
+        preference_name, setting_type = get_preference_layer(preference_file)
+
+        # log( 2, "load__preferences, preference_name: {0}".format( preference_name ) )
+        if preference_name not in preferences:
+            preferences[preference_name] = {}
+
+        if setting_type not in preferences[preference_name]:
+            preferences[preference_name][setting_type] = {}
+
+        #sys.stderr.write("preference_name: %s, setting_type: %s\n" % (preference_name, setting_type))
+        preference = preferences[preference_name][setting_type]
+
+        # log( 2, "preference: " + str( preference ) )
+        preference.update(entries[preference_file]['settings'])
+
+    # for item in preferences:
+    #     print( "isinstance(" + str( item ) + ", str):  " + str( isinstance(item, str) ) )
+    #     print( "isinstance(" + str( item ) + ", dict): " + str( isinstance(item, dict) ) )
+    #     print( "item: " + json.dumps( preferences[item] ) )
+
+    return preferences
+
+
+def load_syntax_names(resource_index):
+    """
+        @return frozenset: the names of all syntaxes, as `Python` for `Python.sublime-syntax`
+    """
+    syntax_names = []
+    syntax_types = [ "*.tmLanguage", "*.sublime-syntax" ]
+
+    with profiler.span("syntax scan"):
+
+        for syntax_type in syntax_types:
+            syntaxes = resource_index.find(syntax_type)
+
+            for syntax in syntaxes:
+                syntax_names.append(os.path.basename(syntax).rsplit('.', 1)[0])
+
+    profiler.count("syntaxes", len( syntax_names ))
+    return frozenset(syntax_names)
+
+
+class ResourceIndex(object):
+    """
+        All the packages resources, enumerated by a single `find_resources()` call and bucketed
+        by their file extension, so the resources of a type are found without a new search.
+    """
+
+    def __init__(self, resources):
+        self.resources = resources
+        self.extensions = {}
+        self.sorted_resources = {}
+
+        for resource in resources:
+            file_name = resource[resource.rfind('/') + 1:]
+            dot = file_name.rfind('.')
+            self.extensions.setdefault(file_name[dot:] if dot > -1 else '', []).append(resource)
+
+    def find(self, pattern):
+        """
+            @pattern   a file name pattern as accepted by `sublime.find_resources()`
+
+            @return list: the resources matching the pattern, on the `find_resources()` order,
+                    which must not be changed
+        """
+
+        # The resources are bucketed by their last extension only, so the patterns with more
+        # extensions, as `*.min.js`, are matched against each resource
+        if pattern.startswith('*.') and pattern.count('.') == 1 and not any( character in pattern[1:] for character in '*?[' ):
+            return self.extensions.get(pattern[1:], [])
+
+        return [ resource for resource in self.resources if fnmatch.fnmatchcase(resource[resource.rfind('/') + 1:], pattern) ]
+
+    def find_sorted(self, pattern):
+        """
+            @return tuple: (resources, rows), with the sorted resources matching the pattern and
+                    their quick panel rows, as ['Monokai.tmTheme', 'Color Scheme - Default'],
+                    which must not be changed
+        """
+
+        if pattern not in self.sorted_resources:
+            resources = sorted(self.find(pattern))
+            rows = [ [ os.path.basename(resource), os.path.dirname(resource).replace("Packages/", "") ] for resource in resources ]
+            self.sorted_resources[pattern] = (resources, rows)
+
+        return self.sorted_resources[pattern]
+
+
+def get_packages_snapshot():
+    """
+        Cheap snapshot of the packages directories, which changes when some package is added,
+        removed or upgraded, or some file is created or deleted directly inside some package.
+    """
+    snapshot = []
+
+    for directory in ( sublime.packages_path(), sublime.installed_packages_path() ):
+
+        try:
+            names = os.listdir(directory)
+
+        except OSError:
+            continue
+
+        for name in sorted(names):
+
+            try:
+                status = os.stat(os.path.join(directory, name))
+                snapshot.append( (directory, name, status.st_size, status.st_mtime) )
+
+            except OSError:
+                pass
+
+    return snapshot
+
+
+def get_resource_from_file(file_path):
+    """
+        @return the resource name as `Packages/User/Preferences.sublime-settings` for a file on
+                the `Packages` directory, otherwise None
+    """
+    packages_path = os.path.realpath(sublime.packages_path())
+    file_path = os.path.realpath(file_path)
+
+    if not file_path.startswith(packages_path + os.sep):
+        return None
+
+    return "Packages/" + os.path.relpath(file_path, packages_path).replace(os.sep, '/')
+
+
+# The layers on the order they override each other, the last one being the default
+setting_layers = ( "user_%s" % sublime.platform(), "user", "default_%s" % sublime.platform(), "default" )
+
+ResolvedSetting = collections.namedtuple('ResolvedSetting', 'value layer default description')
+ResolvedSetting.__doc__ = """
+    A setting as seen from its settings file, where `value` is the effective value, taken from
+    the `layer` which overrides all the others, while `default` and `description` come from its
+    default layer.
+"""
+
+OptionTable = collections.namedtuple('OptionTable', 'source paths rows descriptions positions')
+OptionTable.__doc__ = """
+    The entries of a settings file panel, built from the `source` setting index, where `paths`
+    has the `[setting_file, setting_name]` of each quick panel entry on `rows`, `descriptions`
+    their help texts, and `positions` maps each setting name back to its entry.
+"""
+
+SearchIndex = collections.namedtuple('SearchIndex', 'paths rows descriptions positions')
+SearchIndex.__doc__ = """
+    All the settings of all the settings files, where `paths` has the `(setting_file, setting_name)`
+    of each quick panel entry on `rows`, `descriptions` their help texts, and `positions` maps each
+    path back to its entry.
+"""
+
+
+def build_setting_index(setting_file, default_file=None):
+    """
+        Resolve every setting of a settings file through its layers.
+
+        @setting_file   the settings file layers, as returned by `SettingsCatalog.get_setting_file()`
+        @default_file   the layers providing the settings missing on `setting_file`, if any
+
+        @return a read only mapping of each setting name to its `ResolvedSetting`
+    """
+    setting_files = [ setting_file ]
+
+    if default_file is not None:
+        setting_files.append(default_file)
+
+    index = {}
+
+    # The less important layers are written first, so the next ones override them
+    for setting_file in reversed(setting_files):
+
+        for setting_type in reversed(standard_settings_types):
+
+            for setting_name, setting in setting_file.get(setting_type, {}).items():
+                index[setting_name] = ResolvedSetting(None, None, setting.value, setting.description)
+
+    for setting_name, resolved in index.items():
+
+        for setting_file in setting_files:
+
+            for setting_type in setting_layers:
+                setting = setting_file.get(setting_type, {}).get(setting_name)
+
+                if setting is not None:
+                    index[setting_name] = resolved._replace(value=setting.value, layer=setting_type)
+                    break
+
+            else:
+                continue
+
+            break
+
+    return types.MappingProxyType(index)
+
+
+DESCRIPTION_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize_description(text):
+    """
+        @return list: the lower case words of `text`, also splitting the setting names, as
+                `word_wrap` becomes `word` and `wrap`
+    """
+    return DESCRIPTION_TOKEN_RE.findall(text.lower())
+
+
+class DescriptionIndex(object):
+    """
+        An inverted index from the words of the settings descriptions and names to the settings
+        using them. Each settings file is indexed on its own, so after a file changes only its
+        own settings are indexed again. The descriptions are also kept, to show the search
+        results without resolving their settings files again.
+    """
+
+    # How many times a word on the setting name is worth more than one on its description
+    name_weight = 3
+
+    def __init__(self):
+        self.postings = {}
+        self.documents = {}
+        self.sources = {}
+        self.descriptions = {}
+        self.words = None
+
+    def update_file(self, setting_file, source, setting_index):
+        """
+            @setting_file   the settings file name, as `Preferences`
+            @source         the object `setting_index` was built from, which tells whether the
+                            file needs to be indexed again by `is_current()`
+            @setting_index  the settings file mapping of setting names to `ResolvedSetting`
+        """
+        self.remove_file(setting_file)
+        documents = {}
+        descriptions = {}
+
+        for setting_name, resolved in setting_index.items():
+            counts = collections.Counter()
+            descriptions[setting_name] = resolved.description
+
+            if resolved.description is not no_help_description:
+                counts.update( tokenize_description(resolved.description) )
+
+            for word in tokenize_description(setting_name):
+                counts[word] += self.name_weight
+
+            path = (setting_file, setting_name)
+            documents[path] = counts
+
+            for word, count in counts.items():
+                self.postings.setdefault(word, {})[path] = count
+
+        self.documents[setting_file] = documents
+        self.descriptions[setting_file] = descriptions
+        self.sources[setting_file] = source
+        self.words = None
+
+    def remove_file(self, setting_file):
+
+        for path, counts in self.documents.pop(setting_file, {}).items():
+
+            for word in counts:
+                postings = self.postings[word]
+                del postings[path]
+
+                if not postings:
+                    del self.postings[word]
+
+        self.sources.pop(setting_file, None)
+        self.descriptions.pop(setting_file, None)
+        self.words = None
+
+    def is_current(self, setting_file, source):
+        return self.sources.get(setting_file) is source
+
+    def get_setting_files(self):
+        return list( self.sources )
+
+    def get_description(self, setting_file, setting_name):
+        return self.descriptions[setting_file][setting_name]
+
+    def get_words(self, prefix):
+        """
+            @return list: the indexed words starting with `prefix`
+        """
+
+        if self.words is None:
+            self.words = sorted(self.postings)
+
+        words = []
+        start = bisect.bisect_left(self.words, prefix)
+
+        for word in itertools.islice(self.words, start, None):
+
+            if not word.startswith(prefix):
+                break
+
+            words.append(word)
+
+        return words
+
+    def search(self, query, limit=200):
+        """
+            Rank the settings with all the query words, or words starting with them, by the sum
+            of their words frequencies weighted by how rare each word is.
+
+            @return list: the `(setting_file, setting_name)` of the best results, best first
+        """
+        scores = None
+        total = max( 1, sum( len( documents ) for documents in self.documents.values() ) )
+
+        for query_word in set( tokenize_description(query) ):
+            word_scores = {}
+
+            for word in self.get_words(query_word):
+                postings = self.postings[word]
+
+                # The exact word is worth more than the longer ones starting with it
+                weight = math.log( 1 + total / len( postings ) ) * ( 1 if word == query_word else 0.5 )
+
+                for path, count in postings.items():
+                    word_scores[path] = word_scores.get(path, 0) + count * weight
+
+            if scores is None:
+                scores = word_scores
+
+            else:
+                scores = dict( (path, score + word_scores[path]) for path, score in scores.items() if path in word_scores )
+
+            if not scores:
+                return []
+
+        if not scores:
+            return []
+
+        return heapq.nsmallest(limit, scores, key=lambda path: (-scores[path], path))
+
+
+def get_empty_setting_file():
+    return { 'default': {}, 'default_'+sublime.platform(): {} }
+
+
+class SettingsCatalog(object):
+    """
+        Keeps the parsed settings files between the command invocations. After it is built, a
+        settings file is only parsed again after it is saved, or when some package is added,
+        removed or upgraded. See `get_packages_snapshot()`.
+
+        Building it only lists the settings files names. Each file is parsed, or loaded from the
+        cache, the first time its settings are requested by `get_setting_file()`.
+    """
+
+    def __init__(self):
+        self.entries = None
+        self.resources = []
+        self.resources_by_name = {}
+        self.setting_files = {}
+        self.setting_indexes = {}
+        self.search_index = None
+        self.description_index = DescriptionIndex()
+        self.syntax_names = frozenset()
+        self.resource_index = ResourceIndex([])
+        self.packages_snapshot = None
+        self.stale_resources = set()
+        self.verified_resources = set()
+        self.lock = threading.Lock()
+
+    def invalidate_file(self, file_path):
+        resource = get_resource_from_file(file_path)
+
+        if resource:
+            self.invalidate_resource(resource)
+
+    def invalidate_resource(self, resource):
+        self.stale_resources.add(resource)
+
+    def get_setting_names(self):
+        """
+            @return set: all the settings files names, including the syntaxes without settings files
+        """
+        self.refresh()
+        return set( self.resources_by_name ).union( self.syntax_names )
+
+    def get_syntax_names(self):
+        self.refresh()
+        return self.syntax_names
+
+    def get_resource_index(self):
+        self.refresh()
+        return self.resource_index
+
+    def get_setting_file(self, setting_name):
+        """
+            @setting_name   the settings file name without the platform, as `Preferences`
+
+            @return dict: with all layers of the given settings file, as
+                    {'default': {'word_wrap': SettingRecord('auto', '...')}, 'user': {...}}
+        """
+        self.refresh()
+
+        with self.lock:
+            return self.load_setting_file(setting_name)
+
+    def get_setting_index(self, setting_name, with_preferences):
+        """
+            @setting_name       the settings file name without the platform, as `Preferences`
+            @with_preferences   whether `Preferences` provides the settings missing on the file,
+                                as for the syntax specific settings
+
+            @return a read only mapping of each setting name to its `ResolvedSetting`
+        """
+        self.refresh()
+
+        with self.lock:
+            index_key = (setting_name, with_preferences)
+
+            if index_key not in self.setting_indexes:
+                default_file = self.load_setting_file(default_preferences_file) if with_preferences else None
+
+                with profiler.span("index settings"):
+                    self.setting_indexes[index_key] = build_setting_index(self.load_setting_file(setting_name), default_file)
+
+                profiler.count("settings indexed", len( self.setting_indexes[index_key] ))
+
+            return self.setting_indexes[index_key]
+
+    def get_search_index(self):
+        """
+            Built once after each change on the settings files, so opening the search panel
+            does not need to go through all the settings again.
+
+            @return SearchIndex: with the settings defined by all the settings files
+        """
+        self.refresh()
+
+        with self.lock:
+
+            if self.search_index is None:
+                self.search_index = self.build_search_index()
+
+            return self.search_index
+
+    def get_description_index(self):
+        """
+            Index again only the settings files which changed since the last call.
+
+            @return DescriptionIndex: with the settings of all the settings files
+        """
+        self.refresh()
+
+        with self.lock:
+            self.load_resources(self.resources)
+
+            for setting_file in self.description_index.get_setting_files():
+
+                if setting_file not in self.resources_by_name:
+                    self.description_index.remove_file(setting_file)
+
+            for setting_file in self.resources_by_name:
+                source = self.load_setting_file(setting_file)
+
+                if not self.description_index.is_current(setting_file, source):
+                    self.description_index.update_file(setting_file, source, self.load_file_index(setting_file))
+
+            return self.description_index
+
+    def refresh(self):
+        """
+            Bring the catalog up to date. When it is already being built by another thread, as
+            by the warm up started on `plugin_loaded()`, wait for it instead of building it twice.
+        """
+
+        if not self.lock.acquire(False):
+            sublime.status_message("Quick Settings: Waiting for the settings files to be loaded...")
+            self.lock.acquire()
+
+        try:
+            self.build()
+
+        finally:
+            self.lock.release()
+
+    def build(self):
+
+        with profiler.span("packages snapshot"):
+            packages_snapshot = get_packages_snapshot()
+
+        is_packages_changed = packages_snapshot != self.packages_snapshot
+
+        # New settings files are only found by a new scan, as the ones saved on the `User` package
+        if is_packages_changed or self.stale_resources and not self.stale_resources.issubset(self.resources):
+            self.packages_snapshot = packages_snapshot
+
+            with profiler.span("find_resources"):
+                self.resource_index = ResourceIndex(sublime.find_resources("*"))
+
+            self.resources = self.resource_index.find("*.sublime-settings")
+            self.syntax_names = load_syntax_names(self.resource_index)
+            validator_registry.clear()
+
+            resources_by_name = {}
+
+            for preference_file in self.resources:
+                preference_name = get_preference_layer(preference_file)[0]
+                resources_by_name.setdefault(preference_name, []).append(preference_file)
+
+            # Any resource may have changed with the packages, otherwise only the settings files
+            # with added or removed resources did
+            if is_packages_changed:
+                self.setting_files.clear()
+                self.setting_indexes.clear()
+                self.verified_resources.clear()
+                self.search_index = None
+
+            else:
+                self.discard_setting_files( set( setting_name for setting_name in set( resources_by_name ) | set( self.resources_by_name )
+                        if resources_by_name.get(setting_name) != self.resources_by_name.get(setting_name) ) )
+
+            self.resources_by_name = resources_by_name
+
+            # The files it does not list, as the ones on ignored packages, are not scanned for on
+            # every call. When Sublime Text indexes them later, their package directory changes.
+            self.stale_resources.intersection_update(self.resources)
+
+        # Files saved while they are loaded are invalidated again, and loaded on the next call
+        stale_resources = self.stale_resources.intersection(self.resources)
+        self.stale_resources.difference_update(stale_resources)
+
+        for preference_file in stale_resources:
+
+            if self.entries is not None:
+                self.entries.pop(preference_file, None)
+
+            self.verified_resources.discard(preference_file)
+
+        self.discard_setting_files( set( get_preference_layer(preference_file)[0] for preference_file in stale_resources ) )
+
+    def discard_setting_files(self, setting_names):
+        """
+            Forget the given settings files and the indexes depending on them, so they are loaded
+            again when next requested
+        """
+
+        if not setting_names:
+            return
+
+        for setting_name in setting_names:
+            self.setting_files.pop(setting_name, None)
+
+        # The indexes with the `Preferences` defaults also depend on it, as for the syntaxes
+        for index_key in list( self.setting_indexes ):
+            setting_name, with_preferences = index_key
+
+            if setting_name in setting_names or with_preferences and default_preferences_file in setting_names:
+                del self.setting_indexes[index_key]
+
+        self.search_index = None
+
+    def build_search_index(self):
+        paths = []
+        rows = []
+        descriptions = []
+
+        # Check all the fingerprints at once, so the packed ones can be loaded by several threads
+        self.load_resources(self.resources)
+
+        for setting_file in sorted(self.resources_by_name):
+            setting_index = self.load_file_index(setting_file)
+
+            for setting_name in sorted(setting_index):
+                resolved = setting_index[setting_name]
+
+                paths.append( (setting_file, setting_name) )
+                rows.append( [ setting_file + '/' + setting_name, get_value_preview( resolved.value ) ] )
+                descriptions.append( resolved.description )
+
+        positions = dict( (path, position) for position, path in enumerate(paths) )
+        return SearchIndex(paths, rows, descriptions, positions)
+
+    def load_file_index(self, setting_name):
+        """
+            @return the index of only the settings defined by the given settings file
+        """
+        index_key = (setting_name, False)
+
+        if index_key not in self.setting_indexes:
+            setting_file = self.load_setting_file(setting_name)
+
+            with profiler.span("index settings"):
+                self.setting_indexes[index_key] = build_setting_index(setting_file)
+
+            profiler.count("settings indexed", len( self.setting_indexes[index_key] ))
+
+        return self.setting_indexes[index_key]
+
+    def load_setting_file(self, setting_name):
+
+        if setting_name not in self.setting_files:
+            preferences_files = self.resources_by_name.get(setting_name)
+
+            if preferences_files:
+                self.load_resources(preferences_files)
+                self.setting_files[setting_name] = merge_preference_entries(preferences_files, self.entries)[setting_name]
+
+            else:
+                self.setting_files[setting_name] = get_empty_setting_file()
+
+        return self.setting_files[setting_name]
+
+    def load_resources(self, preferences_files):
+        """
+            Bring the given resources entries up to date, checking the fingerprints only once
+            after each new scan.
+        """
+        loading_files = [ preference_file for preference_file in preferences_files if preference_file not in self.verified_resources ]
+
+        # Only loaded when some settings file is first needed, so listing them does not depend
+        # on how big all of them are
+        if self.entries is None:
+
+            with profiler.span("load the cache"):
+                self.entries = load_catalog_cache()
+
+        if loading_files:
+            entries, is_changed = load_preference_entries(loading_files, self.entries)
+
+            self.entries.update(entries)
+            self.verified_resources.update(loading_files)
+
+            if is_changed:
+                # Also forget the packages which were removed, so the cache does not keep growing
+                resources = set( self.resources )
+                cache = dict( (resource, entry) for resource, entry in self.entries.items() if resource in resources )
+                sublime.set_timeout_async(lambda: save_catalog_cache(cache), 0)
+
+
+settings_catalog = SettingsCatalog()
+
+
+def plugin_unloaded():
+    settings_writer.flush()
+
+
+def plugin_loaded():
+
+    # Build it on the worker thread, so it is ready when the command is first used
+    def warm_up():
+
+        with profiler.run("warm up"):
+            settings_catalog.get_setting_file(default_preferences_file)
+
+    sublime.set_timeout_async(warm_up, 0)
+
+
+class QuickSettingsCatalogListener(sublime_plugin.EventListener):
+
+    def on_post_save(self, view):
+        file_name = view.file_name()
+
+        if file_name and file_name.endswith('.sublime-settings'):
+            settings_catalog.invalidate_file(file_name)
+
+    def on_close(self, view):
+        override_index.discard(('view', view.id()))
+
+
+def get_preview_delay():
+    return sublime.load_settings('Preferences.sublime-settings').get('quick_settings_preview_delay', 150)
+
+
+class PreviewScheduler(object):
+    """
+        Applies the live preview of a setting on a view only after the user stops moving through
+        the options for `quick_settings_preview_delay` milliseconds, so holding the arrow keys on
+        a long list does not re-render the view, or recompile a color scheme, for every entry.
+    """
+
+    def __init__(self, settings, setting_name, original):
+        self.settings = settings
+        self.setting_name = setting_name
+        self.original = original
+        self.generation = 0
+
+    def preview(self, value):
+        self.generation += 1
+        generation = self.generation
+
+        def apply():
+
+            # Only the latest preview is applied, and none after `apply()` or `restore()`
+            if generation == self.generation:
+                self.settings.set(self.setting_name, value)
+
+        sublime.set_timeout(apply, get_preview_delay())
+
+    def apply(self, value):
+        """
+            Set the value right away, cancelling the previews not applied yet
+        """
+        self.generation += 1
+        self.settings.set(self.setting_name, value)
+
+    def restore(self):
+        self.apply(self.original)
+
+
+def get_json_view_length():
+    return sublime.load_settings('Preferences.sublime-settings').get('quick_settings_json_view_length', 80)
+
+
+def get_json_syntax_file():
+    syntax_files = settings_catalog.get_resource_index().find("JSON.sublime-syntax")
+    return syntax_files[0] if syntax_files else default_json_syntax_file
+
+
+def get_validation_delay():
+    return sublime.load_settings('Preferences.sublime-settings').get('quick_settings_validation_delay', 300)
+
+
+class JsonValueEditor(object):
+    """
+        Edits a setting value as JSON on a scratch view, instead of on the input panel, which
+        would decode and preview the whole value on each key typed. The text is only validated
+        after the user stops typing for `quick_settings_validation_delay` milliseconds, and the
+        value is only set when the view is saved or closed, going back to the quick panel then.
+    """
+
+    def __init__(self, command, view, option, validate, preview):
+        """
+            @command    the `QuickSettingsEditPreferencesCommand` to go back to
+            @view       the scratch view with the value
+            @preview    the `PreviewScheduler` of the view the setting was changed for
+        """
+        self.command = command
+        self.view = view
+        self.setting_file = option[0]
+        self.setting_name = option[1]
+        self.validate = validate
+        self.preview = preview
+
+        # The command may show other panels, or be shut down, before the value is set
+        self.target = command.get_setting_target(self.setting_file)
+
+        self.generation = 0
+        self.is_applied = False
+        self.change_count = view.change_count()
+
+        # The change count of the text last validated, and its value or error
+        self.checked = (None, None, None)
+
+    def schedule_validation(self):
+        self.generation += 1
+        generation = self.generation
+
+        def validate():
+
+            # Some other key was typed after this one, so wait for its own timer
+            if generation == self.generation and self.view.id() in value_editors:
+                self.check()
+
+        sublime.set_timeout(validate, get_validation_delay())
+
+    def check(self):
+        """
+            @return tuple: (value, error) for the current text, validating it only once
+        """
+        change_count = self.view.change_count()
+
+        if self.checked[0] != change_count:
+
+            try:
+                value = self.validate( self.view.substr(sublime.Region(0, self.view.size())) )
+                self.checked = (change_count, value, None)
+                self.view.set_status("preferences_editor", "Save to set %s" % (self.setting_file + '/' + self.setting_name))
+
+            except ValueError as error:
+                self.checked = (change_count, None, error)
+                self.view.set_status("preferences_editor", "Invalid Value: %s" % error)
+
+        return self.checked[1:]
+
+    def apply(self):
+        """
+            @return bool: whether the value was valid and set
+        """
+        value, error = self.check()
+
+        if error is not None:
+            sublime.error_message("Invalid Value: %s" % error)
+            return False
+
+        self.preview.apply(value)
+        self.command.save_setting_value(self.target, self.setting_name, value)
+
+        self.is_applied = True
+        sublime.status_message("Set %s to %s" % (self.setting_file + '/' + self.setting_name, get_value_preview( value )))
+        return True
+
+    def close(self):
+        """
+            Set the value when it was changed and not saved, going back to the quick panel
+        """
+
+        if not self.is_applied and self.view.change_count() != self.change_count:
+            value, error = self.check()
+
+            if error is not None:
+                sublime.status_message("Did not set %s, as its value is invalid: %s" % (self.setting_file + '/' + self.setting_name, error))
+
+            else:
+                self.apply()
+
+        window = self.command.window
+        window.focus_view(self.target[0])
 
-        if preference_data:
-            preference_settings = {}
+        sublime.set_timeout(self.command.preferences_selector, 10)
 
-            try:
-                #import spdb ; spdb.start()
-                description = get_descriptions(preference_data)
 
-                #sys.stderr.write("preference_data: %s\n" % preference_)
-                preference_data = sublime.decode_value(preference_data)
+class QuickSettingsJsonViewListener(sublime_plugin.EventListener):
 
-                for setting_name, setting_value in preference_data.items():
+    def on_modified(self, view):
+        editor = value_editors.get(view.id())
 
-                    if setting_name not in description:
-                        preference_settings[setting_name] = {"description": "No help available"}
+        if editor:
+            editor.schedule_validation()
 
-                    else:
-                        preference_settings[setting_name] = description[setting_name]
+    def on_text_command(self, view, command, args):
 
-                    preference_settings[setting_name]['value'] = setting_value
+        # The scratch views have no file to be saved on
+        if command == "save" and view.id() in value_editors:
+            return ("quick_settings_apply_json_value", {})
 
-            except:
-                print( "load_preferences: Error reading %s (preference_data is %s)" % (preference_file, preference_data) )
+    def on_pre_close(self, view):
+        editor = value_editors.pop(view.id(), None)
 
-            preference.update(preference_settings)
+        if editor:
+            editor.close()
 
-    # for item in preferences:
-    #     print( "isinstance(" + str( item ) + ", str):  " + str( isinstance(item, str) ) )
-    #     print( "isinstance(" + str( item ) + ", dict): " + str( isinstance(item, dict) ) )
-    #     print( "item: " + json.dumps( preferences[item] ) )
 
-    return preferences
+class QuickSettingsApplyJsonValueCommand(sublime_plugin.TextCommand):
+    """
+        Sets the value on a `JsonValueEditor` view, closing it when the value is valid
+    """
 
+    def run(self, edit):
+        editor = value_editors.get(self.view.id())
 
-def load_syntax_names():
-    syntax_names = []
-    syntax_types = [ "*.tmLanguage", "*.sublime-syntax" ]
+        if editor and editor.apply():
+            self.view.window().run_command("close_file")
 
-    for syntax_type in syntax_types:
-        syntaxes = sublime.find_resources(syntax_type)
 
-        for syntax in syntaxes:
-            syntax_names.append(os.path.basename(syntax).rsplit('.', 1)[0])
+class QuickSettingsReplaceHelperTextCommand(sublime_plugin.TextCommand):
+    """
+        Replaces the whole helper view contents with one edit, instead of a `select_all` plus an
+        `insert` command, each one adding its own undo entry.
+    """
 
-    return syntax_names
+    def run(self, edit, characters=""):
+        self.view.replace(edit, sublime.Region(0, self.view.size()), characters)
 
 
 class HelperView():
@@ -357,12 +2662,16 @@ class HelperView():
         self.help_view      = self.window.create_output_panel(help_view_name)
         self.help_view_name = help_view_name
 
+        # The descriptions for each option index and the text currently on the view
+        self.texts = []
+        self.text  = None
+
         self.help_view.settings().set('auto_indent', False)
 
-    def disable_panel():
+    def disable_panel(self):
         self.is_enabled = False
 
-    def enable_panel():
+    def enable_panel(self):
         self.is_enabled = True
 
     def run_command(self, command, args={}):
@@ -370,6 +2679,25 @@ class HelperView():
         if self.is_enabled:
             self.help_view.run_command(command, args)
 
+    def set_texts(self, texts, fallback=""):
+        """
+            @texts      the pre-rendered text for each option index
+            @fallback   the text for the indexes past the end of `texts`
+        """
+        self.texts    = texts
+        self.fallback = fallback
+
+    def show_text(self, index):
+        text = self.texts[index] if 0 <= index < len( self.texts ) else self.fallback
+
+        # Moving through the quick panel usually lands on options with the same text
+        if text == self.text:
+            return
+
+        self.text = text
+        self.run_command("quick_settings_replace_helper_text", {"characters": text})
+        self.focus_begining()
+
     def show_panel(self):
 
         if self.is_enabled:
@@ -397,7 +2725,9 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
     # meta.<setting_name>: {
     #      "widget": "select"
     #      "value": [ "", [caption, value] ]
-    #      "validate": "Package Name.module.function"
+    #      "validate": "Package Name.module.function", or "int", "float", "json_list", ...
+    #                  or [ "accepted", "values" ]
+    #                  or { "type": "list", "items": { "type": "int", "minimum": 0 } }
     #      "tip": "text"      in status bar
     #      "help": "Packages/..." or "text"
     # }
@@ -407,12 +2737,29 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
         # log( 2, "set__setting_value, setting_file:      " + str( setting_file ) )
         # log( 2, "set__setting_value, setting_name:      " + str( setting_name ) )
         # log( 2, "set__setting_value, json.dumps(value): " + json.dumps(value) )
+        self.save_setting_value(self.get_setting_target(setting_file), setting_name, value)
+
+    def get_setting_target(self, setting_file):
+        """
+            Take where the value of the selected row is set, so it is still set there after the
+            panel changes, as the value edited by a `JsonValueEditor`.
+
+            @return tuple: (view, setting_file, options_names, index) with the view the panel is
+                    open for, the settings file with `Current Syntax` resolved to the syntax one,
+                    and the panel rows with the index of the setting row
+        """
 
         if setting_file == current_syntax_file:
             setting_file = self.current_syntax
 
-        save_preference(self.view, setting_file, setting_name, value)
-        self.options_names[self.index][1] = json.dumps(value)
+        return self.view, setting_file, self.options_names, self.index
+
+    def save_setting_value(self, target, setting_name, value):
+        view, setting_file, options_names, index = target
+        save_preference(view, setting_file, setting_name, value)
+
+        # The rows may be shared with `option_tables`
+        options_names[index] = [ options_names[index][0], get_value_preview(value) ]
 
     def make_pref_rec(self, setting_file, setting_type, setting_name, value):
         return "%s/%s/%s" % (setting_file, setting_type, setting_name), value
@@ -420,85 +2767,261 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
     def getUserValueAndDescription(self, setting_file, setting_name):
         """
             @setting_name   the name of the setting
-            @setting_file   the name of the setting's file on self.setting_files[setting_file]
+            @setting_file   the name of the setting's file, as on the main panel
 
             @return dictionary with the setting value and description
                     dict: {'value': True, 'description': 'No help available'}
         """
-        _setting = {'value': None, 'description': 'No help available'}
-        platform = sublime.platform()
-        settings = [ self.setting_files[setting_file], self.get_default_setting_names(setting_file) ]
+        resolved = self.get_setting_index(setting_file).get(setting_name)
 
-        setting_types = \
-        [
-            "user_%s" % platform,
-            "user",
-            "default_%s" % platform,
-            "default",
-        ]
+        if resolved is None:
+            return {'value': None, 'description': no_help_description}
+
+        value = resolved.value
+
+        # The last changes may not be written yet
+        if setting_file == current_syntax_file:
+            value = settings_writer.get(self.current_syntax, setting_name, value)
+
+        elif setting_file == this_view_file:
+            value = self.view.settings().get(setting_name)
+
+        elif setting_file == current_project_file:
+            project_settings = self.get_project_settings()
 
-        for setting in settings:
+            if setting_name in project_settings:
+                value = project_settings[setting_name]
 
-            for setting_type in setting_types:
+            value = settings_writer.get_project(self.window, setting_name, value)
 
-                if setting_type in setting:
+        else:
+            value = settings_writer.get(setting_file, setting_name, value)
+
+        return {'value': value, 'description': resolved.description}
+
+    def get_option_table(self, setting_file):
+        """
+            The windows overlays, as `Current Project`, share the table of the settings file they
+            show, only with their own names on the rows.
+
+            @return OptionTable: with the settings of the given setting file, as on the main panel,
+                    with their values as they are on the settings files
+        """
+        setting_index = self.get_setting_index(setting_file)
+        base_file = self.get_base_setting_file(setting_file)
+        option_table = option_tables.get(base_file)
+
+        if option_table is None or option_table.source is not setting_index:
+            profiler.count("options tables built")
+
+            with profiler.span("build the options table"):
+                option_table = self.build_option_table(base_file, setting_index)
+
+            option_tables[base_file] = option_table
+
+        if base_file == setting_file:
+            return option_table
+
+        overlay_table = option_tables.get(setting_file)
+
+        if overlay_table is None or overlay_table.source is not setting_index:
+            overlay_table = self.overlay_option_table(setting_file, option_table)
+            option_tables[setting_file] = overlay_table
+
+        return overlay_table
+
+    def build_option_table(self, setting_file, setting_index):
+        """
+            @return OptionTable: with the settings of the given setting index
+        """
+        paths = []
+        rows = []
+        descriptions = []
 
-                    if setting_name in setting[setting_type]:
-                        _setting = setting[setting_type][setting_name]
+        for setting_name in sorted(setting_index):
+            resolved = setting_index[setting_name]
 
-                        if setting_file == this_view_file:
-                            _setting['value'] = self.view.settings().get(setting_name)
+            paths.append( [setting_file, setting_name] )
+            rows.append( [ setting_file + '/' + setting_name, get_value_preview( resolved.value ) ] )
+            descriptions.append( resolved.description )
 
-                        elif setting_file == current_project_file:
-                            data = self.view.window().project_data()
+        positions = dict( (path[1], position) for position, path in enumerate(paths) )
+        return OptionTable(setting_index, paths, rows, descriptions, positions)
 
-                            if 'settings' in data and setting_name in data['settings']:
-                                _setting['value'] = data['settings'].get(setting_name)
+    def overlay_option_table(self, setting_file, option_table):
+        """
+            @return OptionTable: with the rows of `option_table` named after `setting_file`,
+                    sharing its values previews, descriptions and positions
+        """
+        paths = [ [setting_file, path[1]] for path in option_table.paths ]
+        rows = [ [ setting_file + '/' + path[1], row[1] ] for path, row in zip(option_table.paths, option_table.rows) ]
+
+        return OptionTable(option_table.source, paths, rows, option_table.descriptions, option_table.positions)
+
+    def filter_option_table(self, option_table, setting_names):
+        """
+            @return OptionTable: with only the given settings of `option_table`
+        """
+        positions = sorted( option_table.positions[setting_name] for setting_name in setting_names if setting_name in option_table.positions )
+
+        paths = [ option_table.paths[position] for position in positions ]
+        rows = [ option_table.rows[position] for position in positions ]
+        descriptions = [ option_table.descriptions[position] for position in positions ]
+
+        positions = dict( (path[1], position) for position, path in enumerate(paths) )
+        return OptionTable(option_table.source, paths, rows, descriptions, positions)
 
-                        return _setting
+    def get_overridden_names(self, setting_file):
+        """
+            @return set: the names of the settings of the given setting file, as on the main panel,
+                    which have values different from their defaults
+        """
+        setting_index = self.get_setting_index(setting_file)
 
-        return _setting
+        # The view and project values are compared against the Preferences defaults, and the
+        # view ones also come from its syntax and project settings, so they are found again
+        # after any of these change
+        if setting_file == this_view_file:
+            syntax = get_current_syntax(self.view)
+            syntax_index = self.get_setting_index(syntax) if syntax else None
+            key, source = ('view', self.view.id()), (syntax, setting_index, syntax_index, self.get_project_settings())
 
-    def get_default_setting_names(self, setting_name):
-        pref_default = None
+        elif setting_file == current_project_file:
+            key, source = ('project', self.window.id()), (self.get_project_settings(), setting_index)
 
-        if self.is_preferences(setting_name):
-            pref_default = self.setting_files[default_preferences_file]
+        elif setting_file == current_syntax_file:
+            key, source = self.current_syntax, setting_index
 
         else:
-            pref_default = {'default': {}, 'default_'+sublime.platform(): {}}
+            key, source = setting_file, setting_index
 
-        return pref_default
+        setting_names = override_index.get(key, source)
 
-    def get_setting_names(self, setting_name):
-        setting = self.setting_files[setting_name]
-        # log( 2, "get__setting_names, setting:      " + str( setting ) )
-        # log( 2, "get__setting_names, setting type: " + str( type( setting ) ) )
+        if setting_names is None:
+
+            with profiler.span("find the overridden settings"):
+                setting_names = self.find_overridden_names(setting_file, setting_index)
+
+            override_index.set(key, source, setting_index, setting_names)
+
+        return setting_names
+
+    def find_overridden_names(self, setting_file, setting_index):
+        """
+            Only the settings on the user layers, or on the project, can be overridden, so only
+            them are compared against their defaults, except for the view, which has no layers.
+        """
+
+        if setting_file == this_view_file:
+            settings = self.view.settings()
+            values = dict( (setting_name, settings.get(setting_name)) for setting_name in setting_index )
 
-        if self.is_preferences(setting_name):
-            pref_default = self.setting_files[default_preferences_file]
+        elif setting_file == current_project_file:
+            values = dict( self.get_project_settings() )
+            values.update( settings_writer.pending_projects.get(self.window.id(), (None, {}))[1] )
 
         else:
-            pref_default = {'default': {}, 'default_'+sublime.platform(): {}}
-
-        return set \
-        (
-            [ x
-                for y in standard_settings_types
-                for x in setting.get(y, {}).keys()
-            ] +
-            [ x
-                for y in standard_settings_types
-                for x in pref_default.get(y, {}).keys()
-            ]
-        )
+            setting_name = self.current_syntax if setting_file == current_syntax_file else setting_file
+            layers = settings_catalog.get_setting_file(setting_name)
+            values = {}
+
+            # The platform layer overrides the other
+            for setting_type in reversed(setting_layers[:2]):
+                values.update( (name, record.value) for name, record in layers.get(setting_type, {}).items() )
+
+            values.update( settings_writer.pending.get(setting_name, {}) )
+
+        return set( setting_name for setting_name, value in values.items()
+                if setting_name not in setting_index or not is_same_value(value, setting_index[setting_name].default) )
+
+    def get_value_overrides(self, setting_file):
+        """
+            @return dict: the values which differ from the settings files ones, as the changes
+                    not written yet, for the settings of the given setting file
+        """
+
+        if setting_file == current_syntax_file:
+            return settings_writer.pending.get(self.current_syntax, {})
+
+        elif setting_file == this_view_file:
+            settings = self.view.settings()
+            return dict( (setting_name, settings.get(setting_name)) for setting_name in self.get_setting_names(setting_file) )
+
+        elif setting_file == current_project_file:
+            overrides = dict( self.get_project_settings() )
+            overrides.update( settings_writer.pending_projects.get(self.window.id(), (None, {}))[1] )
+            return overrides
+
+        return settings_writer.pending.get(setting_file, {})
+
+    def get_project_settings(self):
+        """
+            @return dict: the project settings, as they were when the panel was built, because
+                    each `project_data()` call copies the whole project structure
+        """
+
+        self.check_snapshots()
+
+        if self.project_settings is None:
+            data = self.window.project_data() or {}
+            self.project_settings = data.get('settings', {})
+
+        return self.project_settings
+
+    def get_setting_index(self, setting_file):
+        """
+            @return the read only mapping of the settings of the given setting file, as on the
+                    main panel, to their `ResolvedSetting`
+        """
+
+        self.check_snapshots()
+
+        if setting_file not in self.setting_indexes:
+            base_file = self.get_base_setting_file(setting_file)
+
+            # All the windows share the same index for their overlays
+            if setting_file in overlay_settings_names:
+                self.setting_indexes[setting_file] = settings_catalog.get_setting_index(base_file, False)
+
+            else:
+                self.setting_indexes[setting_file] = settings_catalog.get_setting_index(base_file, self.is_preferences(setting_file))
+
+        return self.setting_indexes[setting_file]
+
+    def check_snapshots(self):
+        """
+            Forget the setting indexes and the project settings taken before the last changes
+            were written, as the writer only keeps the changes not written yet
+        """
+
+        if self.flushes != settings_writer.flushes:
+            self.flushes = settings_writer.flushes
+            self.setting_indexes = {}
+            self.project_settings = None
+
+    def get_base_setting_file(self, setting_file):
+        """
+            @return str: the settings file shown by the given one on the main panel, as
+                    `Preferences` for `Current Project`
+        """
+
+        if setting_file == current_syntax_file:
+            return self.current_syntax
+
+        if setting_file in overlay_settings_names:
+            return default_preferences_file
+
+        return setting_file
+
+    def get_setting_names(self, setting_name):
+        return self.get_setting_index(setting_name).keys()
 
     def is_preferences(self, setting_file):
         return setting_file in self.syntax_names or setting_file in standard_settings_names
 
     def getDefaultValueAndDescription(self, setting_file, setting_name, is_metadata=False):
         """
-        @setting_file  the name of the setting file name on self.setting_files
+        @setting_file  the name of the setting file, as on the main panel
         @setting_name  the name of the setting
 
             setting_file: Preferences
@@ -512,15 +3035,10 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
         {'value': 0, 'description': 'Set to a value other than 0 to force wrapping at that column rather than the\nwindow width\n'}
         {'value': './\\()"\'-:,.;<>~!@#$%^&*|+=[]{}`~?', 'description': 'Characters that are considered to separate words\n'}
         """
-        setting = self.setting_files[setting_file]
-
-        for item in standard_settings_types:
-
-            if setting_name in setting.get(item, {}):
-                return setting[item][setting_name]
+        resolved = self.get_setting_index(setting_file).get(setting_name)
 
-        if self.is_preferences(setting_file):
-            return self.getDefaultValueAndDescription(default_preferences_file, setting_name, is_metadata)
+        if resolved is not None:
+            return {'value': resolved.default, 'description': resolved.description}
 
         if is_metadata:
             return None
@@ -529,7 +3047,7 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
 
     def getSettingMetadata(self, setting_file, setting_name, defaultValueAndDescription):
         """
-            @setting_file                  the name of the setting file name on self.setting_files
+            @setting_file                  the name of the setting file, as on the main panel
             @setting_name                  the name of the setting
             @defaultValueAndDescription    a dictionary with the keys `value` and `description` for
                                             the given setting file and setting setting_file.
@@ -595,22 +3113,25 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
 
         settings = view.settings()
         default  = settings.get(setting_name, "")
+        preview  = PreviewScheduler(settings, setting_name, default)
 
         def done(index):
             # log( 8, "widget__select_bool, done, index: " + str( index ) )
             view.erase_status("preferences_editor")
 
             if index < 1:
-                settings.set( setting_name, default )
+                preview.restore()
 
                 if index < 0:
                     return self.shutdown()
 
             elif index == 1:
+                preview.apply(True)
                 self.set_setting_value(setting_file, setting_name, True)
                 sublime.status_message("Set %s to %s" % (setting_file + '/' + setting_name, 'True'))
 
             else:
+                preview.apply(False)
                 self.set_setting_value(setting_file, setting_name, False)
                 sublime.status_message("Set %s to %s" % (setting_file + '/' + setting_name, 'False'))
 
@@ -619,13 +3140,13 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
         def highlight(index):
 
             if index < 1:
-                settings.set(setting_name, default)
+                preview.preview(default)
 
             elif index == 1:
-                settings.set(setting_name, True)
+                preview.preview(True)
 
             elif index == 2:
-                settings.set(setting_name, False)
+                preview.preview(False)
 
         # for op in options: log( 2, "op: {0}".format( op ) )
         view.set_status("preferences_editor", "Set %s" % (setting_file + '/' + setting_name))
@@ -640,6 +3161,7 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
 
         settings = view.settings()
         default  = settings.get(setting_name, "")
+        preview  = PreviewScheduler(settings, setting_name, default)
 
         # values.append({})
         options  = []
@@ -671,7 +3193,7 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
             view.erase_status("preferences_editor")
 
             if index < 1:
-                settings.set( setting_name, default )
+                preview.restore()
 
                 if index == 0:
                     return self.preferences_selector()
@@ -683,6 +3205,7 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
             if commands:
 
                 if commands[index]:
+                    preview.restore()
                     context = view
 
                     if types[index] == "window":
@@ -691,18 +3214,24 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
                     sublime.set_timeout(lambda: context.run_command(commands[index], args[index]), 10)
                     return
 
+            preview.apply(_values[index])
             self.set_setting_value(setting_file, setting_name, _values[index])
             sublime.status_message("Set %s to %s" % (setting_file + '/' + setting_name, str(_values[index])))
             self.preferences_selector()
 
         def highlight(index):
             # log( 8, "widget__select, highlight: setting %s to %s" % (setting_name, _values[index]) )
-            settings.set(setting_name, _values[index])
+            preview.preview(_values[index])
 
         view.set_status("preferences_editor", "Set %s" % (setting_file + '/' + setting_name))
         show_quick_panel(view, options, done, highlight)
 
     def widget_multiselect(self, option, value=None, validate=None, values=None):
+        """
+            Shows all the options on a single panel, where selecting one adds it to the list, or
+            removes it when it is already there. The panel opens again on the same option after
+            each toggle, so several options are changed before saving them.
+        """
         # log( 8, "widget__multiselect, option: %s" % str(option) )
         view = self.window.active_view()
 
@@ -711,98 +3240,87 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
 
         settings = view.settings()
         default  = settings.get(setting_name, "")
+        preview  = PreviewScheduler(settings, setting_name, default)
 
-        if len( values ) > 0 and isinstance( values[0], str ):
-            _values = [ dict(caption=_value, value=_value) for _value in values ]
-
-        other = []
-
-        def do_add_option():
-            options = \
-            [
-                _value.get('caption', str(_value.get('value')))
-                for _value in _values if _value['value'] not in value
-            ]
-
-            def done(index):
-
-                if index < 0:
-                    settings.set( setting_name, default )
-                    return self.shutdown()
+        captions   = []
+        value_keys = []
+        _values    = []
 
-                value.append(other[index])
-                settings.set(setting_name, value)
-                do_show_panel()
+        for data in values or []:
 
-            show_quick_panel(view, options, done)
+            if not isinstance( data, dict ):
+                data = {"value": data}
 
-        def do_remove_option():
-            options = \
-            [
-                _value.get('caption', str(_value.get('value')))
-                for _value in _values if _value['value'] in value
-            ]
+            _values.append( data.get('value') )
+            value_keys.append( json.dumps( data.get('value'), sort_keys=True ) )
+            captions.append( data.get('caption', str( data.get('value') )) )
 
-            def done(index):
+        # The selected values by their keys, on the setting order. The values not listed on the
+        # options are kept as they are.
+        selected = collections.OrderedDict()
 
-                if index < 0:
-                    settings.set( setting_name, default )
-                    return self.shutdown()
+        for item in value if isinstance( value, list ) else []:
+            selected[json.dumps( item, sort_keys=True )] = item
 
-                value.remove(value[index])
-                settings.set(setting_name, value)
-                do_show_panel()
+        def get_row(index):
+            return [ ( "[x] " if value_keys[index] in selected else "[ ] " ) + captions[index], get_value_preview( _values[index] ) ]
 
-            show_quick_panel(view, options, done)
+        options = \
+        [
+            ["Save Changes", get_value_preview( list( selected.values() ) )],
+            ["Cancel Changes", "Go back to the settings menu"],
+        ]
 
-        def do_show_panel():
-            other[:] = [ _value['value'] for _value in _values if _value['value'] not in value ]
+        options.extend( get_row( index ) for index in range( len( _values ) ) )
 
-            options = \
-            [
-                ["Save Changes", json.dumps(value)],
-                ["Add Option", "From: "+json.dumps(other)],
-                ["Remove Option", "From:"+json.dumps(value)]
-            ]
+        def done(index):
+            view.erase_status("preferences_editor")
 
-            def done(index):
-                view.erase_status("preferences_editor")
+            if index < 0:
+                preview.restore()
+                return self.shutdown()
 
-                if index < 0:
-                    settings.set( setting_name, default )
-                    return self.shutdown()
+            if index == 0:
+                new_value = list( selected.values() )
 
-                if index == 0:
-                    self.set_setting_value(setting_file, setting_name, value)
-                    sublime.status_message("Set %s to %s" % (setting_file + '/' + setting_name, str( value )))
-                    self.preferences_selector()
+                preview.apply(new_value)
+                self.set_setting_value(setting_file, setting_name, new_value)
+                sublime.status_message("Set %s to %s" % (setting_file + '/' + setting_name, str( new_value )))
+                return self.preferences_selector()
 
-                if index == 1:
+            if index == 1:
+                preview.restore()
+                return self.preferences_selector()
 
-                    if len( other ) > 0:
-                        do_add_option()
+            value_key = value_keys[index - 2]
 
-                    else:
-                        sublime.status_message("No options available to add.")
-                        do_show_panel()
+            if value_key in selected:
+                del selected[value_key]
 
-                if index == 2:
+            else:
+                selected[value_key] = _values[index - 2]
 
-                    if len( value ) > 0:
-                        do_remove_option()
+            # Only the toggled option and the saved value rows change
+            new_value = list( selected.values() )
+            options[0] = ["Save Changes", get_value_preview( new_value )]
+            options[index] = get_row( index - 2 )
 
-                    else:
-                        sublime.status_message("No options available to remove.")
-                        do_show_panel()
+            preview.preview(new_value)
+            show_panel(index)
 
+        def show_panel(last=-1):
             view.set_status("preferences_editor", "Set %s" % (setting_file + '/' + setting_name))
-            show_quick_panel(view, options, done)
+            show_quick_panel(view, options, done, last=last)
 
-        do_show_panel()
+        show_panel()
 
     def widget_select_resource(self, option, value=None, validate=None, find_resources=""):
         # log( 8, "widget__select_resource, option: %s" % str(option) )
-        resources = sorted(sublime.find_resources(find_resources))
+        resources, options = settings_catalog.get_resource_index().find_sorted(find_resources)
+
+        # They are shared with the next times this widget is open
+        resources = list( resources )
+        options = list( options )
 
         setting_file = option[0]
         setting_name = option[1]
@@ -810,11 +3328,8 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
         view     = self.window.active_view()
         settings = self.view.settings()
 
-        options = []
         default = settings.get(setting_name, "")
-
-        for resource in resources:
-            options.append( [ os.path.basename(resource), os.path.dirname(resource).replace("Packages/", "") ] )
+        preview = PreviewScheduler(settings, setting_name, default)
 
         options.insert( 0, ["Cancel Selection", "Go back to the settings menu"] )
         resources.insert( 0, default )
@@ -823,45 +3338,73 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
             view.erase_status("preferences_editor")
 
             if index < 1:
-                settings.set( setting_name, default )
+                preview.restore()
 
                 if index == 0:
-                    self.preferences_selector()
+                    return self.preferences_selector()
 
                 else:
                     return self.shutdown()
 
+            preview.apply(resources[index])
             self.set_setting_value(setting_file, setting_name, resources[index])
             sublime.status_message("Set %s to %s" % (setting_file + '/' + setting_name, str( resources[index] )))
             self.preferences_selector()
 
         def highlight(index):
             # log( 8, "widget__select_resource, highlight: setting %s to %s" % (setting_file, resources[index]) )
-            settings.set(setting_name, resources[index])
+            preview.preview(resources[index])
 
         view.set_status("preferences_editor", "Set %s" % (setting_file + '/' + setting_name))
         show_quick_panel(view, options, done, highlight)
 
+    def widget_json_view(self, option, value=None, validate=None):
+        """
+            Edits the value on a new scratch view, see `JsonValueEditor`
+        """
+        setting_file = option[0]
+        setting_name = option[1]
+
+        settings = self.view.settings()
+        preview  = PreviewScheduler(settings, setting_name, settings.get(setting_name, ""))
+
+        view = self.window.new_file()
+        view.set_scratch(True)
+        view.set_name("%s/%s.json" % (setting_file, setting_name))
+        view.set_syntax_file(get_json_syntax_file())
+
+        # The editor is only registered after the text is inserted, so it is not validated
+        view.run_command("quick_settings_replace_helper_text", {"characters": sublime.encode_value(value, True)})
+        view.set_status("preferences_editor", "Save to set %s, or close to go back" % (setting_file + '/' + setting_name))
+
+        value_editors[view.id()] = JsonValueEditor(self, view, option, validate, preview)
+
     def widget_input(self, option, value=None, validate=None):
         setting_file = option[0]
         setting_name = option[1]
 
+        # The input panel would decode and preview the whole value on each key typed
+        if isinstance(value, (list, dict)) and len( json.dumps(value) ) > get_json_view_length():
+            return self.widget_json_view(option, value, validate)
+
         view = self.view
         view.set_status("preferences_editor", "Set %s" % (setting_file  + '/' + setting_name))
 
         settings = view.settings()
         default  = settings.get(setting_name, "")
+        preview  = PreviewScheduler(settings, setting_name, default)
 
         def done(value):
             view.erase_status("preferences_editor")
 
             try:
                 value = validate(value)
+                preview.apply(value)
                 self.set_setting_value(setting_file, setting_name, value)
                 sublime.status_message("Set %s to %s" % (setting_file + '/' + setting_name, str( value )))
 
             except ValueError as e:
-                settings.set( setting_name, default )
+                preview.restore()
                 sublime.error_message("Invalid Value: %s" % e)
 
             self.preferences_selector()
@@ -870,15 +3413,15 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
 
             try:
                 value = validate(value)
-                settings.set(setting_name, value)
+                preview.preview(value)
                 # log( 8, "widget__input, change: set %s to %s" % (setting_name, value) )
 
             except ValueError as e:
-                settings.set( setting_name, default )
+                preview.preview(default)
                 sublime.status_message("Invalid Value: %s" % e)
 
         def cancel():
-            settings.set( setting_name, default )
+            preview.restore()
             view.erase_status("preferences_editor")
             self.preferences_selector()
 
@@ -900,9 +3443,10 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
         settingMetadata = self.getSettingMetadata(setting_file, setting_name, defaultValueAndDescription)
         # log( 8, "run__widget, settingMetadata: " + str( settingMetadata ) )
 
+        # The widgets change these in place, and they belong to the shared settings catalog
         widget   = settingMetadata.get('widget', 'input')
         validate = settingMetadata.get('validate', 'str')
-        args     = settingMetadata.get('args', {})
+        args     = copy.deepcopy( settingMetadata.get('args', {}) )
 
         # log( 8, "run__widget, widget:   " + str( widget ) )
         # log( 8, "run__widget, validate: " + str( validate ) )
@@ -911,26 +3455,12 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
         userValueAndDescription = self.getUserValueAndDescription(setting_file, setting_name)
         # log( 8, "run__widget, userValueAndDescription: " + str( userValueAndDescription ) )
 
-        if isinstance(validate, list):
-            validate_in_list = validate
-
-            def _validate_element(x):
-
-                if x in validate_in_list:
-                    return x
-
-                else:
-                    raise ValueError("Value must be one of %s" % validate_in_list)
-
-            validate = _validate_element
-
-        elif '.' not in validate:
-            validate = eval(validate)
+        validate = validator_registry.get(validate)
 
         if hasattr(self, "widget_"+widget):
             widget_func = getattr(self, "widget_"+widget)
 
-        widget_func(option, value=userValueAndDescription.get('value'), validate=validate, **args)
+        widget_func(option, value=copy.deepcopy( userValueAndDescription.get('value') ), validate=validate, **args)
 
     def change_value(self, options_path, index):
         setting_file = options_path[index][0]
@@ -946,34 +3476,47 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
 
     def shutdown(self):
         self.help_view.hide_panel()
+        settings_writer.flush()
 
-    def run(self, setting_file=None, syntax_name=None):
+        # Each window keeps its command instance, so it should not keep the panel rows after
+        # closing it, while all of them share the settings catalog
+        self.help_view.set_texts( [] )
+        self.options_names = []
+        self.setting_indexes = {}
+        self.preferences_selector = lambda: None
+
+    def run(self, setting_file=None, syntax_name=None, setting_name=None, overridden_only=False):
         r"""
         :param syntax_name:
             Name of syntax, you want to edit settings for
 
         :param setting_file:
             Name of settings' file, you want to edit.
+
+        :param setting_name:
+            Name of the setting on `setting_file`, to edit right away.
+
+        :param overridden_only:
+            Only list the settings with values different from their defaults.
         """
 
-        self.view          = self.window.active_view()
-        self.setting_files = load_preferences()
+        with profiler.run("%s panel" % (setting_file or "Main")):
+            self.show_panel(setting_file, syntax_name, setting_name, overridden_only)
 
-        self.syntax_names   = load_syntax_names()
+    def show_panel(self, setting_file, syntax_name, setting_name, overridden_only):
+        self.view          = self.window.active_view()
+        self.syntax_names   = settings_catalog.get_syntax_names()
         self.setting_file   = setting_file
+        self.setting_name   = setting_name
         self.current_syntax = get_current_syntax(self.view, syntax_name)
 
-        for syntax in self.syntax_names:
-
-            if syntax not in self.setting_files:
-                self.setting_files[syntax] = { 'default': {}, 'default_'+sublime.platform(): {} }
+        self.overridden_only = overridden_only
+        self.access_key = (setting_file, 'overridden') if overridden_only else setting_file
 
-        # https://bitbucket.org/klorenz/sublimepreferenceseditor/pull-requests/4
-        if self.current_syntax in self.setting_files:
-            self.setting_files[current_syntax_file] = self.setting_files[self.current_syntax]
-
-        self.setting_files[this_view_file] = { 'default': {}, 'default_'+sublime.platform(): {} }
-        self.setting_files[current_project_file] = { 'default': {}, 'default_'+sublime.platform(): {} }
+        # The settings files are only parsed when they are first used
+        self.setting_indexes = {}
+        self.project_settings = None
+        self.flushes = settings_writer.flushes
 
         options_names = []
         options_paths = []
@@ -981,13 +3524,20 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
 
         options_names.append( [ "QUIT (Esc)", "End Edit Settings" ] )
         options_paths.append( ["Filler", "To keep the same index as options_names"] )
-        options_desciptions.append( { "description": "You can press Esc, or select this option to end editing settings.\n" } )
+        options_desciptions.append( "You can press Esc, or select this option to end editing settings.\n" )
 
         if setting_file is None:
-            # log( 2, "run, self.setting_files.keys(): " + str( self.setting_files.keys() ) )
             self.is_main_panel = True
 
-            for setting_file in sorted(self.setting_files.keys()):
+            setting_names = settings_catalog.get_setting_names()
+            # log( 2, "run, setting_names: " + str( setting_names ) )
+            setting_names.update( [ this_view_file, current_project_file ] )
+
+            # https://bitbucket.org/klorenz/sublimepreferenceseditor/pull-requests/4
+            if self.current_syntax in setting_names:
+                setting_names.add(current_syntax_file)
+
+            for setting_file in sorted(setting_names):
                 # log( 2, 'run, setting_file: ' + str( setting_file ) )
 
                 if setting_file in self.syntax_names:
@@ -1021,27 +3571,36 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
 
             options_names.append( [ "BACK (Open the Main Menu)", "Choose another Setting to Edit" ] )
             options_paths.append( ["Filler", "To keep the same index as options_names"] )
-            options_desciptions.append( { "description": "Select this option to take another setting to edit.\n" } )
+            options_desciptions.append( "Select this option to take another setting to edit.\n" )
+
+            if overridden_only:
+                options_names.append( [ "SHOW ALL SETTINGS", "Also list the settings with their default values" ] )
 
-            for setting_name in sorted(self.get_setting_names(setting_file)):
-                # log( 2, 'run, setting_name: ' + str( setting_name ) )
+            else:
+                options_names.append( [ "SHOW OVERRIDDEN SETTINGS", "Only list the settings changed from their defaults" ] )
+
+            options_paths.append( ["Filler", "To keep the same index as options_names"] )
+            options_desciptions.append( "Select this option to switch between all the settings and only the ones changed from their defaults.\n" )
 
-                option_path = [setting_file, setting_name]
-                # log( 2, 'run, option_path: ' + str( option_path ) )
+            option_table = self.get_option_table(setting_file)
+            options_start_index = len( options_names )
 
-                options_paths.append( option_path )
-                userValueAndDescription = self.getUserValueAndDescription(setting_file, setting_name)
+            if overridden_only:
+                option_table = self.filter_option_table(option_table, self.get_overridden_names(setting_file))
 
-                # log( 4, 'run, userValueAndDescription: ', json.dumps( userValueAndDescription, indent=4 ) )
-                option_name = setting_file + '/' + setting_name
+            profiler.count("options listed", len( option_table.rows ))
 
-                # log( 2, 'run, option_name: ' + str( option_name ) )
-                options_names.append( [ option_name, json.dumps( userValueAndDescription.get('value') ) ] )
+            options_paths.extend( option_table.paths )
+            options_names.extend( option_table.rows )
+            options_desciptions.extend( option_table.descriptions )
 
-                defaultValueAndDescription = self.getDefaultValueAndDescription(setting_file, setting_name)
-                # log( 4, "run, defaultValueAndDescription: ", json.dumps( defaultValueAndDescription, indent=4 ) )
+            # Only the values which are not on the settings files yet need new rows
+            for setting_name, value in self.get_value_overrides(setting_file).items():
+                position = option_table.positions.get(setting_name)
 
-                options_desciptions.append( defaultValueAndDescription )
+                if position is not None:
+                    option_name = option_table.rows[position][0]
+                    options_names[options_start_index + position] = [ option_name, get_value_preview( value ) ]
 
         self.help_view = HelperView(self.window, "preferences_editor_help", self.view.settings().get('always_show_helper_view', False))
 
@@ -1049,20 +3608,12 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
         if main_function_key not in last_access:
             last_access[main_function_key] = 0
 
+        self.help_view.set_texts( options_desciptions, "Package Settings" )
         self.help_view.show_panel()
 
         def on_highlighted(index):
             # log( 8, "run, on_highlighted, index: " + str( index ) )
-            self.help_view.run_command("select_all")
-
-            if index < len( options_desciptions ):
-                # log( 8, "run, on_highlighted, index: " + str( options_desciptions[index] ) )
-                self.help_view.run_command("insert", {"characters": options_desciptions[index]['description']})
-
-            else:
-                self.help_view.run_command("insert", {"characters": "Package Settings"})
-
-            self.help_view.focus_begining()
+            self.help_view.show_text( index )
 
         def done(index):
             # log( 8, "run, done, index:              " + str( index ) )
@@ -1076,14 +3627,17 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
 
             elif index == 1 and not self.is_main_panel:
                 self.shutdown()
-                self.window.run_command(command_name)
+                self.window.run_command(command_name, {"overridden_only": self.overridden_only})
+
+            elif index == 2 and not self.is_main_panel:
+                self.window.run_command(command_name, {"setting_file": self.setting_file, "overridden_only": not self.overridden_only})
 
             elif self.is_main_panel:
                 last_access[main_function_key] = index
-                self.window.run_command(command_name, {"setting_file": options_names[index][0]})
+                self.window.run_command(command_name, {"setting_file": options_names[index][0], "overridden_only": self.overridden_only})
 
             else:
-                last_access[options_paths[index][0]] = index
+                last_access[self.access_key] = index
 
                 self.index = index
                 self.change_value(options_paths, index)
@@ -1096,13 +3650,187 @@ class QuickSettingsEditPreferencesCommand(sublime_plugin.WindowCommand):
 
         else:
             # Only create a dictionary entry for the remaining keys when it is required
-            if self.setting_file not in last_access:
-                last_access[self.setting_file] = 0
+            if self.access_key not in last_access:
+                last_access[self.access_key] = 0
 
-            position = lambda: last_access[self.setting_file]
+            position = lambda: last_access[self.access_key]
 
         self.options_names = options_names
         self.preferences_selector = lambda: show_quick_panel(self.view, self.options_names, done, on_highlighted, position)
-        self.preferences_selector()
 
+        option_path = [self.setting_file, self.setting_name]
+
+        if self.setting_name is not None and option_path in options_paths:
+            done( options_paths.index( option_path ) )
+
+        else:
+            self.preferences_selector()
+
+
+class QuickSettingsSearchSettingsCommand(sublime_plugin.WindowCommand):
+    """
+        Lists the settings of all the settings files on a single quick panel, opening the selected
+        one on the `quick_settings_edit_preferences` widgets.
+    """
+
+    def get_rows(self, search_index):
+        """
+            @return list: the index rows, showing the values waiting to be written
+        """
+        rows = search_index.rows
+
+        for setting_file, changes in settings_writer.pending.items():
+
+            for setting_name, value in changes.items():
+                position = search_index.positions.get( (setting_file, setting_name) )
+
+                if position is not None:
+
+                    # Only copy the rows when some value is changed
+                    if rows is search_index.rows:
+                        rows = list( rows )
+
+                    rows[position] = [ rows[position][0], get_value_preview( value ) ]
+
+        return rows
+
+    def run(self):
+        view = self.window.active_view()
+        search_index = settings_catalog.get_search_index()
+
+        help_view = HelperView(self.window, "preferences_editor_help", view.settings().get('always_show_helper_view', False))
+        help_view.set_texts( search_index.descriptions )
+        help_view.show_panel()
+
+        if search_function_key not in last_access:
+            last_access[search_function_key] = 0
+
+        def done(index):
+
+            if index < 0:
+                return help_view.hide_panel()
+
+            last_access[search_function_key] = index
+            setting_file, setting_name = search_index.paths[index]
+
+            self.window.run_command(command_name, {"setting_file": setting_file, "setting_name": setting_name})
+
+        show_quick_panel(view, self.get_rows(search_index), done, help_view.show_text, last_access[search_function_key])
+
+
+class QuickSettingsSearchDescriptionsCommand(sublime_plugin.WindowCommand):
+    """
+        Searches the settings by the words on their descriptions and names, as `wrap long lines`,
+        opening the selected one on the `quick_settings_edit_preferences` widgets.
+    """
+
+    last_query = ""
+
+    def run(self, query=None):
+        view = self.window.active_view()
+
+        if query is None:
+            return show_input(view, "Search the settings descriptions:", self.last_query, self.run)
+
+        self.last_query = query
+
+        description_index = settings_catalog.get_description_index()
+        paths = description_index.search(query)
+
+        if not paths:
+            return sublime.status_message("Quick Settings: No setting description matches `%s`" % query)
+
+        rows = []
+        descriptions = []
+
+        for setting_file, setting_name in paths:
+            description = description_index.get_description(setting_file, setting_name)
+            rows.append( [ setting_file + '/' + setting_name, description.strip().split("\n", 1)[0] ] )
+            descriptions.append( description )
+
+        help_view = HelperView(self.window, "preferences_editor_help", view.settings().get('always_show_helper_view', False))
+        help_view.set_texts( descriptions )
+        help_view.show_panel()
+
+        def done(index):
+
+            if index < 0:
+                return help_view.hide_panel()
+
+            setting_file, setting_name = paths[index]
+            self.window.run_command(command_name, {"setting_file": setting_file, "setting_name": setting_name})
+
+        show_quick_panel(view, rows, done, help_view.show_text)
+
+
+class QuickSettingsApplySettingsProfileCommand(sublime_plugin.WindowCommand):
+    """
+        Applies one of the `quick_settings_profiles`, as `presentation`, changing all its settings
+        files at once
+    """
+
+    def run(self, profile=None):
+        """
+            @profile    the name of the profile to apply, or None to choose it on a quick panel
+        """
+        profiles = get_setting_profiles()
+
+        if not profiles:
+            return sublime.status_message("Quick Settings: There are no profiles on the `quick_settings_profiles` setting")
+
+        if profile is None:
+            return self.show_profiles(profiles)
+
+        if profile not in profiles:
+            return sublime.status_message("Quick Settings: There is no profile named `%s`" % profile)
+
+        changed_files = apply_setting_profile(profile, profiles[profile])
+        sublime.status_message("Quick Settings: Applied the profile `%s` on %s" % (profile, ", ".join(changed_files) or "no settings file"))
+
+    def show_profiles(self, profiles):
+        active_name = load_profile_state().get('name')
+        names = sorted(profiles)
+        rows = []
+
+        for name in names:
+            setting_files = [setting_file for setting_file, settings in profiles[name].items() if isinstance(settings, dict)]
+            settings_count = sum( len( profiles[name][setting_file] ) for setting_file in setting_files )
+
+            rows.append( [ name + ( " (active)" if name == active_name else "" ),
+                    "%s settings on %s" % (settings_count, ", ".join(setting_files)) ] )
+
+        def done(index):
+
+            if index > -1:
+                self.run(profile=names[index])
+
+        show_quick_panel(self.window.active_view(), rows, done, last=names.index(active_name) if active_name in names else -1)
+
+
+class QuickSettingsRevertSettingsProfileCommand(sublime_plugin.WindowCommand):
+    """
+        Restores the settings values from before the active profile was applied
+    """
+
+    def run(self):
+        profile, changed_files = revert_setting_profile()
+
+        if profile is None:
+            return sublime.status_message("Quick Settings: There is no profile applied to revert")
+
+        sublime.status_message("Quick Settings: Reverted the profile `%s` on %s" % (profile, ", ".join(changed_files) or "no settings file"))
+
+
+class QuickSettingsProfileReportCommand(sublime_plugin.WindowCommand):
+    """
+        Shows how long each phase of the last panels runs took, on an output panel
+    """
+
+    def run(self, runs=None):
+        """
+            @runs   how many of the last runs to show, or all the ones kept
+        """
+        panel = self.window.create_output_panel("quick_settings_profile")
+        panel.run_command("quick_settings_replace_helper_text", {"characters": profiler.get_report(runs)})
 
+        self.window.run_command("show_panel", {"panel": "output.quick_settings_profile"})